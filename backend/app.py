@@ -1,10 +1,14 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
+from flask_migrate import Migrate
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import config
 from models import db
 import os
 
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
 def create_app(config_name='development'):
     """Application factory"""
     # Set static folder to frontend directory
@@ -15,10 +19,37 @@ def create_app(config_name='development'):
     # Load configuration
     app.config.from_object(config[config_name])
     
+    # Fast JSON encoding (orjson when installed) with native datetime support
+    from utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    
+    if app.config['TRUSTED_PROXY_HOPS']:
+        hops = app.config['TRUSTED_PROXY_HOPS']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+    
     # Initialize extensions
     CORS(app, origins=app.config['CORS_ORIGINS'])
     db.init_app(app)
     JWTManager(app)
+    Migrate(app, db, directory=MIGRATIONS_DIR)
+    
+    # Opt-in request timings (Server-Timing, /metrics, sampled profiles); first so it times the other hooks
+    from utils.instrumentation import init_instrumentation
+    init_instrumentation(app)
+    
+    from utils.cache import init_cache
+    init_cache(app)
+    
+    # Throttle before any view runs, so rejected requests skip the database and bcrypt
+    from utils.rate_limit import init_rate_limiter
+    init_rate_limiter(app)
+    
+    # GETs read from replicas when configured; registered before jobs so inline job writes count as writes
+    from utils.replicas import init_replicas
+    init_replicas(app)
+    
+    from utils.jobs import init_jobs
+    init_jobs(app)
     
     # Register blueprints
     from routes.auth import auth_bp
@@ -26,33 +57,28 @@ def create_app(config_name='development'):
     from routes.bookings import bookings_bp
     from routes.reviews import reviews_bp
     from routes.admin import admin_bp
+    from routes.analytics import analytics_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(locations_bp)
     app.register_blueprint(bookings_bp)
     app.register_blueprint(reviews_bp)
     app.register_blueprint(admin_bp)
+    app.register_blueprint(analytics_bp)
     
-    # Create database tables
-    with app.app_context():
-        db.create_all()
-        
-        # Create default admin user if not exists
-        from models import User
-        admin = User.query.filter_by(email='admin@vcloak.com').first()
-        if not admin:
-            admin = User(
-                email='admin@vcloak.com',
-                name='Admin',
-                role='admin',
-                verified=True
-            )
-            admin.set_password('admin123')
-            db.session.add(admin)
-            db.session.commit()
-            print('Default admin user created: admin@vcloak.com / admin123')
+    # Register CLI commands
+    from commands import register_commands
+    register_commands(app)
     
     # Error handlers
+    from utils.passwords import PasswordHasherBusy
+    
+    @app.errorhandler(PasswordHasherBusy)
+    def password_hasher_busy(error):
+        response = jsonify({'error': 'Server busy, please retry'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    
     @app.errorhandler(404)
     def not_found(error):
         return jsonify({'error': 'Not found'}), 404
@@ -77,7 +103,8 @@ def create_app(config_name='development'):
                 'locations': '/api/locations',
                 'bookings': '/api/bookings',
                 'reviews': '/api/reviews',
-                'admin': '/api/admin'
+                'admin': '/api/admin',
+                'analytics': '/api/analytics'
             }
         }), 200
     
@@ -94,4 +121,11 @@ def create_app(config_name='development'):
 
 if __name__ == '__main__':
     app = create_app()
+    
+    # Local development convenience; deployments run `flask init-db` and `flask seed-admin`
+    from commands import init_db, seed_admin
+    with app.app_context():
+        init_db()
+        seed_admin(app.config['ADMIN_EMAIL'], app.config['ADMIN_PASSWORD'])
+    
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,86 @@
+"""Benchmark tail latency of a cheap endpoint during a burst of logins.
+
+Each storm thread logs in over and over while the main thread times
+GET /api/locations/<id>. Compare runs with different --hash-workers to see
+how the bcrypt pool size trades login throughput for everyone else's
+latency.
+
+Usage (from backend/):
+    python -m benchmarks.bench_login_storm --storm 8 --hash-workers 1 2 4
+"""
+import argparse
+import threading
+
+from benchmarks.common import make_app, measure, format_result
+
+def seed(app):
+    """Create a login user and one location to read"""
+    from models import db, User, StorageLocation
+    
+    with app.app_context():
+        user = User(email='storm@example.com', name='Storm', role='traveler')
+        user.set_password('password123')
+        db.session.add(user)
+        db.session.flush()
+        location = StorageLocation(
+            provider_id=user.id, business_name='Bench', address='1 Bench Street',
+            latitude=48.8566, longitude=2.3522, capacity=10, price_per_hour=2.5,
+            verified=True, active=True
+        )
+        db.session.add(location)
+        db.session.commit()
+        return location.id
+
+def run_storm(app, threads, stop):
+    """Start threads that log in until stop is set, returning them and a login counter"""
+    logins = []
+    
+    def storm():
+        client = app.test_client()
+        count = 0
+        while not stop.is_set():
+            client.post('/api/auth/login', json={'email': 'storm@example.com', 'password': 'password123'})
+            count += 1
+        logins.append(count)
+    
+    workers = [threading.Thread(target=storm, daemon=True) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    return workers, logins
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--storm', type=int, default=8, help='Concurrent login threads')
+    parser.add_argument('--hash-workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+    
+    import utils.passwords as passwords
+    
+    app = make_app()
+    app.config['PASSWORD_HASH_QUEUE'] = args.storm
+    app.config['RATE_LIMIT_ENABLED'] = False  # Measure hashing, not throttling
+    location_id = seed(app)
+    client = app.test_client()
+    url = f'/api/locations/{location_id}'
+    
+    for hash_workers in args.hash_workers:
+        app.config['PASSWORD_HASH_WORKERS'] = hash_workers
+        passwords._executor = None  # Rebuild the pool with this size
+        
+        quiet = measure(lambda: client.get(url), repeat=args.repeat)
+        
+        stop = threading.Event()
+        workers, logins = run_storm(app, args.storm, stop)
+        stormy = measure(lambda: client.get(url), repeat=args.repeat)
+        stop.set()
+        for worker in workers:
+            worker.join()
+        
+        print(f'--- {hash_workers} hash workers, {args.storm} login threads ---')
+        print(format_result(f'GET {url} (idle)', quiet))
+        print(format_result(f'GET {url} (login storm)', stormy))
+        print(f'{"logins completed":<40} {sum(logins)}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Micro-benchmarks for the helpers and serializers on the request hot path.
+
+Reports the cost per call of distance and price calculations, each model's
+to_dict(), and JSON encoding of a page of locations. Models are built in
+memory, so no database round trips are included.
+
+Usage (from backend/):
+    python -m benchmarks.bench_micro --number 20000
+"""
+import argparse
+import random
+import timeit
+from datetime import datetime, timedelta
+
+from benchmarks.common import make_app
+from benchmarks.seed_data import AMENITIES, CITIES
+
+def build_models(rng):
+    """Build one of each model, with the relationships their to_dict() reads"""
+    from models import User, StorageLocation, Booking, Review, LocationOccupancy
+    
+    now = datetime.utcnow()
+    user = User(id=1, email='bench@example.com', name='Bench', role='traveler', verified=True,
+                created_at=now)
+    lat, lng = CITIES[0]
+    location = StorageLocation(
+        id=1, provider_id=1, business_name='Bench', address='1 Bench Street',
+        latitude=lat, longitude=lng, capacity=10, price_per_hour=2.5,
+        amenities=rng.sample(AMENITIES, 3), photos=[], description='Storage for benchmarks',
+        rating=4.5, total_reviews=10, verified=True, active=True, created_at=now
+    )
+    booking = Booking(
+        id=1, traveler_id=1, location_id=1, check_in=now, check_out=now + timedelta(hours=3),
+        num_bags=2, total_price=15.0, status='confirmed', payment_status='pending',
+        created_at=now, updated_at=now
+    )
+    review = Review(id=1, booking_id=1, traveler_id=1, location_id=1, rating=5, comment='Great',
+                    created_at=now, reviewer=user)
+    occupancy = LocationOccupancy(location_id=1, bucket_start=now, bags=3)
+    return user, location, booking, review, occupancy
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000, help='Calls per timing run')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs; the best is reported')
+    parser.add_argument('--batch', type=int, default=1000, help='Points per batch distance call')
+    args = parser.parse_args()
+    
+    app = make_app()
+    from utils.helpers import calculate_distance, calculate_distances, calculate_price
+    
+    rng = random.Random(42)
+    lat, lng = CITIES[0]
+    latitudes = [lat + rng.uniform(-0.5, 0.5) for _ in range(args.batch)]
+    longitudes = [lng + rng.uniform(-0.5, 0.5) for _ in range(args.batch)]
+    check_in = datetime(2030, 1, 1, 10)
+    check_out = datetime(2030, 1, 1, 17, 30)
+    
+    with app.app_context():
+        user, location, booking, review, occupancy = build_models(rng)
+        page = [location.to_dict() for _ in range(100)]
+        
+        cases = [
+            ('calculate_distance', lambda: calculate_distance(lat, lng, latitudes[0], longitudes[0]), 1),
+            (f'calculate_distances ({args.batch} points)',
+             lambda: calculate_distances(lat, lng, latitudes, longitudes, 5), 1 / 100),
+            ('calculate_price', lambda: calculate_price(check_in, check_out, 2.5), 1),
+            ('User.to_dict', user.to_dict, 1),
+            ('StorageLocation.to_dict', location.to_dict, 1),
+            ('Booking.to_dict', booking.to_dict, 1),
+            ('Review.to_dict', review.to_dict, 1),
+            ('LocationOccupancy.to_dict', occupancy.to_dict, 1),
+            ('JSON encode 100 locations', lambda: app.json.dumps_bytes({'locations': page}), 1 / 100),
+        ]
+        
+        for label, fn, scale in cases:
+            number = max(1, int(args.number * scale))
+            best = min(timeit.repeat(fn, number=number, repeat=args.repeat)) / number
+            print(f'{label:<40} {best * 1e6:10.2f}us per call')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark radius search latency at increasing numbers of locations.
+
+Compares the indexed bounding-box search behind /api/locations/nearby with a
+full scan that runs Haversine over every active location.
+
+Usage (from backend/):
+    python -m benchmarks.bench_nearby --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import random
+
+from benchmarks.common import make_app, measure, format_result
+from benchmarks.seed_data import CITIES
+
+def seed_locations(db, count, rng):
+    """Insert count verified locations scattered around CITIES"""
+    from models import StorageLocation
+    from utils.cache import invalidate_tags
+    
+    db.session.query(StorageLocation).delete()
+    rows = []
+    for i in range(count):
+        lat, lng = rng.choice(CITIES)
+        rows.append({
+            'provider_id': 1,
+            'business_name': f'Location {i}',
+            'address': f'{i} Bench Street',
+            'latitude': lat + rng.uniform(-0.5, 0.5),
+            'longitude': lng + rng.uniform(-0.5, 0.5),
+            'capacity': 10,
+            'price_per_hour': 2.5,
+            'verified': True,
+            'active': True
+        })
+    db.session.execute(db.insert(StorageLocation), rows)
+    db.session.commit()
+    invalidate_tags('locations')  # Core inserts skip the routes that normally do this
+
+def full_scan(lat, lng, radius):
+    """Baseline: load every active location and filter in Python"""
+    from models import StorageLocation
+    from utils.helpers import calculate_distance
+    
+    nearby = []
+    for loc in StorageLocation.query.filter_by(active=True, verified=True).all():
+        distance = calculate_distance(lat, lng, loc.latitude, loc.longitude)
+        if distance <= radius:
+            loc_dict = loc.to_dict()
+            loc_dict['distance'] = distance
+            nearby.append(loc_dict)
+    nearby.sort(key=lambda x: x['distance'])
+    return nearby
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--radius', type=float, default=5)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    # Time the search itself: a response cache would answer every repeat after the first
+    os.environ['CACHE_BACKEND'] = 'null'
+    app = make_app()
+    from models import db
+    
+    rng = random.Random(args.seed)
+    lat, lng = CITIES[0]
+    client = app.test_client()
+    url = f'/api/locations/nearby?lat={lat}&lng={lng}&radius={args.radius}'
+    
+    for size in args.sizes:
+        with app.app_context():
+            seed_locations(db, size, rng)
+            scan = measure(lambda: full_scan(lat, lng, args.radius), repeat=args.repeat)
+        indexed = measure(lambda: client.get(url), repeat=args.repeat)
+        
+        print(f'--- {size} locations ---')
+        print(format_result('full scan', scan))
+        print(format_result('GET /api/locations/nearby', indexed))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Compare requests/sec and tail latency of gunicorn serving modes.
+
+Starts gunicorn once per mode against a seeded SQLite database with a
+simulated database round trip (see latency_app.py), then drives it with
+concurrent HTTP clients.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serving --modes sync gthread --concurrency 32
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from benchmarks.common import BACKEND_DIR
+
+MODES = {
+    'sync': {'GUNICORN_WORKER_CLASS': 'sync'},
+    'gthread': {'GUNICORN_WORKER_CLASS': 'gthread'}
+}
+
+def seed(database_url):
+    """Create the schema and one verified location for the nearby search"""
+    from benchmarks.common import make_app
+    app = make_app(database_url)
+    from models import db, StorageLocation
+    
+    with app.app_context():
+        db.session.add(StorageLocation(
+            provider_id=1, business_name='Bench', address='1 Bench Street',
+            latitude=48.8566, longitude=2.3522, capacity=10, price_per_hour=2.5,
+            verified=True, active=True
+        ))
+        db.session.commit()
+
+def wait_until_up(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server did not start: {url}')
+
+def drive(url, concurrency, duration):
+    """Hit url from concurrent clients for duration seconds, returning latencies in ms"""
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    
+    def client():
+        local = []
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            urllib.request.urlopen(url, timeout=30).read()
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+    
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--db-latency-ms', type=float, default=5)
+    parser.add_argument('--port', type=int, default=5099)
+    args = parser.parse_args()
+    
+    fd, path = tempfile.mkstemp(suffix='.db', prefix='vcloak-bench-')
+    os.close(fd)
+    database_url = f'sqlite:///{path}'
+    seed(database_url)
+    
+    # Time-window searches skip the response cache, so every request reaches the database
+    url = (f'http://127.0.0.1:{args.port}/api/locations/nearby?lat=48.8566&lng=2.3522'
+           '&check_in=2030-01-01T10:00:00Z&check_out=2030-01-01T12:00:00Z')
+    
+    for mode in args.modes:
+        env = {
+            **os.environ,
+            **MODES[mode],
+            'DATABASE_URL': database_url,
+            'PORT': str(args.port),
+            'WEB_CONCURRENCY': str(args.workers),
+            'GUNICORN_THREADS': str(args.threads),
+            'BENCH_DB_LATENCY_MS': str(args.db_latency_ms)
+        }
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--access-logfile', os.devnull,
+             'benchmarks.latency_app:app'],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_until_up(url)
+            latencies = drive(url, args.concurrency, args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+        
+        print(f'--- {mode}: {args.workers} workers, {args.concurrency} clients, '
+              f'{args.db_latency_ms}ms per query ---')
+        print(f'requests/sec  {len(latencies) / args.duration:10.1f}')
+        print(f'p50           {statistics.median(latencies):10.2f}ms')
+        print(f'p99           {latencies[int(len(latencies) * 0.99) - 1]:10.2f}ms')
+
+if __name__ == '__main__':
+    main()
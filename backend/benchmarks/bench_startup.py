@@ -0,0 +1,72 @@
+"""Measure how long a fresh worker takes to import the app and run create_app().
+
+Each run is a new interpreter, like a gunicorn worker booting after a fork
+or a cold start on Render. Optionally also times `flask init-db` and
+`flask seed-admin`, which now run once per deploy instead of per worker.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import BACKEND_DIR
+
+# Runs in the child interpreter and prints its timings as JSON
+PROBE = """
+import json, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app('production')
+created = time.perf_counter()
+print(json.dumps({'import': (imported - start) * 1000, 'create_app': (created - imported) * 1000}))
+"""
+
+def run_probe(env):
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    timings = json.loads(output.strip().splitlines()[-1])
+    timings['process'] = (time.perf_counter() - start) * 1000
+    return timings
+
+def run_command(env, *args):
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-m', 'flask', '--app', 'wsgi', *args], cwd=BACKEND_DIR, env=env,
+        capture_output=True, check=True
+    )
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--database-url', help='Defaults to a throwaway SQLite database')
+    args = parser.parse_args()
+    
+    database_url = args.database_url
+    if database_url is None:
+        fd, path = tempfile.mkstemp(suffix='.db', prefix='vcloak-bench-')
+        os.close(fd)
+        database_url = f'sqlite:///{path}'
+    env = {**os.environ, 'DATABASE_URL': database_url, 'FLASK_ENV': 'production'}
+    
+    print(f"{'flask init-db':<20} {run_command(env, 'init-db'):10.1f}ms")
+    print(f"{'flask seed-admin':<20} {run_command(env, 'seed-admin'):10.1f}ms")
+    
+    runs = [run_probe(env) for _ in range(args.runs)]
+    print(f'--- worker boot, median of {args.runs} runs ---')
+    for key, label in (('import', 'import app'), ('create_app', 'create_app()'), ('process', 'whole process')):
+        print(f'{label:<20} {statistics.median(run[key] for run in runs):10.1f}ms')
+
+if __name__ == '__main__':
+    main()
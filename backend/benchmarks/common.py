@@ -0,0 +1,54 @@
+"""Shared helpers for the benchmark scripts"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def make_app(database_url=None):
+    """Create an app bound to a throwaway SQLite database unless a URL is given"""
+    if database_url is None:
+        fd, path = tempfile.mkstemp(suffix='.db', prefix='vcloak-bench-')
+        os.close(fd)
+        database_url = f'sqlite:///{path}'
+    # Config reads DATABASE_URL at import time
+    os.environ['DATABASE_URL'] = database_url
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    
+    from app import create_app
+    from commands import init_db
+    app = create_app('production')
+    with app.app_context():
+        init_db()
+    return app
+
+def measure(fn, repeat=50, warmup=5):
+    """Call fn repeatedly and return latency percentiles in milliseconds"""
+    for _ in range(warmup):
+        fn()
+    
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    
+    return percentiles(samples)
+
+def percentiles(samples):
+    """Summarize latency samples in milliseconds as p50/p95/p99/mean"""
+    samples = sorted(samples)
+    return {
+        'p50': statistics.median(samples),
+        'p95': samples[max(0, int(len(samples) * 0.95) - 1)],
+        'p99': samples[max(0, int(len(samples) * 0.99) - 1)],
+        'mean': statistics.fmean(samples)
+    }
+
+def format_result(label, result):
+    """Format a percentile result as a single report line"""
+    return (f"{label:<40} p50={result['p50']:8.2f}ms  p95={result['p95']:8.2f}ms  "
+            f"p99={result['p99']:8.2f}ms")
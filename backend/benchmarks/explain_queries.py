@@ -0,0 +1,130 @@
+"""Check that the read endpoints' queries use indexes at realistic row counts.
+
+Seeds a database, calls each listing endpoint (and its second page), captures
+the SQL it runs and EXPLAINs every SELECT. Exits non-zero if any plan scans a
+whole table: "SCAN <table>" on SQLite, "Seq Scan" on PostgreSQL.
+
+Usage (from backend/):
+    python -m benchmarks.explain_queries
+    python -m benchmarks.explain_queries --database-url postgresql://... --bookings 500000
+"""
+import argparse
+import re
+import sys
+
+from benchmarks.common import make_app
+from benchmarks import seed_data
+
+SQLITE_SCAN = re.compile(r'^SCAN (\w+)$')
+POSTGRES_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+def full_scans(connection, statement, parameters, tables):
+    """EXPLAIN a statement and return the tables it reads in full"""
+    if connection.dialect.name == 'postgresql':
+        plan = connection.exec_driver_sql('EXPLAIN ' + statement, parameters).scalars().all()
+        return [match.group(1) for line in plan for match in [POSTGRES_SCAN.search(line)] if match]
+    
+    plan = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+    return [match.group(1) for row in plan for match in [SQLITE_SCAN.match(row[-1])]
+            if match and match.group(1) in tables]
+
+def seed_endpoints(app, providers, travelers, locations, bookings, reviews, seed=42):
+    """Seed the database and return the read endpoints to check as (url, headers) pairs"""
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import text
+    from models import db, User
+    from utils.auth_helpers import token_claims
+    
+    with app.app_context():
+        seeded = seed_data.seed(db, providers, travelers, locations, bookings, reviews, seed)
+        if db.engine.dialect.name == 'postgresql':
+            db.session.execute(text('ANALYZE'))
+            db.session.commit()
+        
+        def auth(user_id):
+            user = db.session.get(User, user_id)
+            token = create_access_token(identity=str(user.id), additional_claims=token_claims(user))
+            return {'Authorization': f'Bearer {token}'}
+        
+        admin = auth(seeded['admin_id'])
+        provider = auth(seeded['provider_ids'][0])
+        traveler = auth(seeded['traveler_ids'][0])
+        location_id = seeded['location_ids'][0]
+    
+    window = 'check_in=2030-01-01T10:00:00Z&check_out=2030-01-01T12:00:00Z'
+    return [
+        ('/api/locations', None),
+        ('/api/locations?verified=true', None),
+        ('/api/locations/nearby?lat=48.85&lng=2.35&radius=50', None),
+        (f'/api/locations/nearby?lat=48.85&lng=2.35&radius=50&{window}', None),
+        (f'/api/locations/{location_id}', None),
+        (f'/api/locations/{location_id}/availability?from=2030-01-01T00:00:00Z&to=2030-01-02T00:00:00Z', None),
+        (f'/api/reviews/location/{location_id}', None),
+        ('/api/bookings', traveler),
+        ('/api/bookings?status=confirmed', traveler),
+        ('/api/bookings/provider', provider),
+        ('/api/admin/users', admin),
+        ('/api/admin/users?role=provider', admin),
+        ('/api/admin/providers', admin),
+        ('/api/admin/bookings', admin),
+        ('/api/admin/bookings?status=pending', admin),
+    ]
+
+def check_plans(app, endpoints):
+    """Call each endpoint (and its second page) and EXPLAIN every SELECT it runs
+    
+    Yields (url, status code, tables read in full) per request.
+    """
+    from models import db
+    from utils.query_counter import count_queries
+    
+    with app.app_context():
+        tables = set(db.metadata.tables)
+    client = app.test_client()
+    for url, headers in endpoints:
+        urls = [url]
+        while urls:
+            url = urls.pop()
+            with app.app_context(), count_queries() as counter:
+                response = client.get(url, headers=headers)
+            if response.status_code != 200:
+                yield url, response.status_code, set()
+                continue
+            
+            scans = set()
+            with app.app_context(), db.engine.connect() as connection:
+                for statement, parameters in zip(counter.statements, counter.parameters):
+                    if statement.lstrip().upper().startswith('SELECT'):
+                        scans.update(full_scans(connection, statement, parameters, tables))
+            yield url, response.status_code, scans
+            
+            # Check the keyset query behind the second page too
+            next_cursor = (response.get_json() or {}).get('next_cursor')
+            if next_cursor and 'cursor=' not in url:
+                urls.append(url + ('&' if '?' in url else '?') + f'cursor={next_cursor}')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', help='Defaults to a throwaway SQLite database')
+    seed_data.add_arguments(parser)
+    parser.set_defaults(providers=2000, travelers=20000, locations=20000, bookings=200000, reviews=20000)
+    args = parser.parse_args()
+    
+    app = make_app(args.database_url)
+    endpoints = seed_endpoints(app, args.providers, args.travelers, args.locations, args.bookings,
+                               args.reviews, args.seed)
+    
+    failures = 0
+    for url, status, scans in check_plans(app, endpoints):
+        if status != 200:
+            print(f'{url}: HTTP {status}')
+        elif scans:
+            print(f"FAIL {url}  full scan: {', '.join(sorted(scans))}")
+        else:
+            print(f'ok   {url}')
+        failures += status != 200 or bool(scans)
+    
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
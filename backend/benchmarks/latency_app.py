@@ -0,0 +1,21 @@
+"""WSGI app for serving benchmarks that adds a fixed delay to every SQL statement.
+
+Simulates the network round trip to a remote database (e.g. NeonDB) while
+running against local SQLite. Set BENCH_DB_LATENCY_MS to the delay.
+"""
+import os
+import time
+
+from sqlalchemy import event
+
+from app import create_app
+from models import db
+
+app = create_app(os.getenv('FLASK_ENV', 'production'))
+
+_latency = float(os.getenv('BENCH_DB_LATENCY_MS', 5)) / 1000
+
+with app.app_context():
+    @event.listens_for(db.engine, 'before_cursor_execute')
+    def _simulate_round_trip(conn, cursor, statement, parameters, context, executemany):
+        time.sleep(_latency)
@@ -0,0 +1,276 @@
+"""HTTP load driver covering every blueprint, with throughput and latency percentiles.
+
+By default seeds a throwaway SQLite database (see seed_data.py) and drives
+the app in-process through the Flask test client. With --url it drives a
+running server instead; seed its database with seed_data.py using the same
+counts and start it with RATE_LIMIT_ENABLED=false.
+
+Save a run with --output and pass it to a later run as --compare to fail
+(exit 1) when any scenario's p99 regresses beyond --tolerance.
+
+Usage (from backend/):
+    python -m benchmarks.load_test --duration 10 --concurrency 8 --output baseline.json
+    python -m benchmarks.load_test --compare baseline.json
+    python -m benchmarks.load_test --url http://localhost:5000 --blueprints locations bookings
+"""
+import argparse
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timedelta
+
+from benchmarks.common import make_app, percentiles
+from benchmarks import seed_data
+
+class TestClientTransport:
+    """Sends requests through the Flask test client, one client per thread"""
+    
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+    
+    def request(self, method, path, headers=None, body=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, headers=headers, json=body)
+        return response.status_code, response.get_json(silent=True)
+
+class HTTPTransport:
+    """Sends requests to a running server over one keep-alive connection per thread"""
+    
+    def __init__(self, base_url):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port
+        if parsed.scheme == 'https':
+            self.connection_class = http.client.HTTPSConnection
+        else:
+            self.connection_class = http.client.HTTPConnection
+        self._local = threading.local()
+    
+    def request(self, method, path, headers=None, body=None):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = self.connection_class(self.host, self.port, timeout=30)
+        
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        try:
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            self._local.connection = None
+            raise
+        
+        try:
+            return response.status, json.loads(data)
+        except ValueError:
+            return response.status, None
+
+BLUEPRINTS = ['auth', 'locations', 'bookings', 'reviews', 'admin', 'analytics']
+
+def build_scenarios(args, rng_lock, rng):
+    """Scenarios per blueprint: (name, role, method, path(), body(), ok statuses)"""
+    location_ids = range(1, args.locations + 1)
+    
+    def pick(seq):
+        with rng_lock:
+            return rng.choice(seq)
+    
+    def city():
+        lat, lng = pick(seed_data.CITIES)
+        return f'lat={lat}&lng={lng}&radius=5'
+    
+    def window():
+        with rng_lock:
+            check_in = datetime(2030, 1, 1) + timedelta(hours=rng.randrange(24 * 365))
+            hours = rng.randrange(1, 8)
+        return check_in, check_in + timedelta(hours=hours)
+    
+    def window_query():
+        check_in, check_out = window()
+        return f'check_in={check_in.isoformat()}Z&check_out={check_out.isoformat()}Z'
+    
+    def new_booking():
+        check_in, check_out = window()
+        return {'location_id': pick(location_ids), 'check_in': check_in.isoformat() + 'Z',
+                'check_out': check_out.isoformat() + 'Z', 'num_bags': 1}
+    
+    login = {'email': 'traveler0@bench.test', 'password': seed_data.PASSWORD}
+    never = lambda: None
+    
+    return {
+        'auth': [
+            ('auth.login', None, 'POST', lambda: '/api/auth/login', lambda: login, (200,)),
+            ('auth.me', 'traveler', 'GET', lambda: '/api/auth/me', never, (200,)),
+        ],
+        'locations': [
+            ('locations.list', None, 'GET', lambda: '/api/locations', never, (200,)),
+            ('locations.list_verified', None, 'GET', lambda: '/api/locations?verified=true', never, (200,)),
+            ('locations.detail', None, 'GET', lambda: f'/api/locations/{pick(location_ids)}', never, (200,)),
+            ('locations.nearby', None, 'GET', lambda: f'/api/locations/nearby?{city()}', never, (200,)),
+            ('locations.nearby_window', None, 'GET',
+             lambda: f'/api/locations/nearby?{city()}&{window_query()}', never, (200,)),
+            ('locations.availability', None, 'GET',
+             lambda: f'/api/locations/{pick(location_ids)}/availability?from=2030-01-01T00:00:00Z'
+                     '&to=2030-01-02T00:00:00Z', never, (200,)),
+        ],
+        'bookings': [
+            ('bookings.list', 'traveler', 'GET', lambda: '/api/bookings', never, (200,)),
+            ('bookings.provider', 'provider', 'GET', lambda: '/api/bookings/provider', never, (200,)),
+            # Full or unverified locations are expected answers, not errors
+            ('bookings.create', 'traveler', 'POST', lambda: '/api/bookings', new_booking, (201, 400, 409)),
+        ],
+        'reviews': [
+            ('reviews.location', None, 'GET', lambda: f'/api/reviews/location/{pick(location_ids)}', never,
+             (200,)),
+        ],
+        'admin': [
+            ('admin.stats', 'admin', 'GET', lambda: '/api/admin/stats', never, (200,)),
+            ('admin.users', 'admin', 'GET', lambda: '/api/admin/users', never, (200,)),
+            ('admin.providers', 'admin', 'GET', lambda: '/api/admin/providers', never, (200,)),
+            ('admin.bookings', 'admin', 'GET', lambda: '/api/admin/bookings?status=pending', never, (200,)),
+        ],
+        'analytics': [
+            ('analytics.provider', 'provider', 'GET', lambda: '/api/analytics/provider', never, (200,)),
+            ('analytics.admin', 'admin', 'GET', lambda: '/api/analytics/admin?from=2030-01-01&to=2030-12-31',
+             never, (200,)),
+        ],
+    }
+
+def login_all(transport):
+    """Log in once per role and return their Authorization headers"""
+    headers = {}
+    for role, email in (('admin', 'admin@bench.test'), ('provider', 'provider0@bench.test'),
+                        ('traveler', 'traveler0@bench.test')):
+        status, body = transport.request('POST', '/api/auth/login',
+                                         body={'email': email, 'password': seed_data.PASSWORD})
+        if status != 200:
+            raise RuntimeError(f'Login as {email} failed with HTTP {status}; is the database seeded?')
+        headers[role] = {'Authorization': f"Bearer {body['access_token']}"}
+    return headers
+
+def run_phase(transport, scenarios, auth, concurrency, duration):
+    """Cycle through scenarios from concurrent threads for duration seconds
+    
+    Returns {scenario name: {'latencies': [ms], 'errors': count}}.
+    """
+    results = {name: {'latencies': [], 'errors': 0} for name, *_ in scenarios}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    
+    def worker(offset):
+        local = {name: ([], 0) for name, *_ in scenarios}
+        i = offset
+        while time.monotonic() < deadline:
+            name, role, method, path, body, ok = scenarios[i % len(scenarios)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                status, _ = transport.request(method, path(), auth.get(role), body())
+                failed = status not in ok
+            except (http.client.HTTPException, OSError):
+                failed = True
+            latencies, errors = local[name]
+            latencies.append((time.perf_counter() - start) * 1000)
+            local[name] = (latencies, errors + failed)
+        
+        with lock:
+            for name, (latencies, errors) in local.items():
+                results[name]['latencies'].extend(latencies)
+                results[name]['errors'] += errors
+    
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def summarize(results, duration):
+    summary = {}
+    for name, result in results.items():
+        if not result['latencies']:
+            continue
+        summary[name] = {
+            **percentiles(result['latencies']),
+            'requests': len(result['latencies']),
+            'rps': len(result['latencies']) / duration,
+            'errors': result['errors']
+        }
+    return summary
+
+def compare(summary, baseline, tolerance):
+    """Return the scenarios whose p99 regressed beyond tolerance, or that started failing"""
+    regressions = []
+    for name, current in summary.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current['p99'] > previous['p99'] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {previous['p99']:.2f}ms -> {current['p99']:.2f}ms")
+        if current['errors'] and not previous['errors']:
+            regressions.append(f"{name}: {current['errors']} errors")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='Base URL of a running server; defaults to the in-process test client')
+    parser.add_argument('--blueprints', nargs='+', choices=BLUEPRINTS, default=BLUEPRINTS)
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per blueprint')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--output', help='Write the results as JSON')
+    parser.add_argument('--compare', help='Baseline JSON from an earlier --output')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed p99 regression (0.25 = 25%%)')
+    seed_data.add_arguments(parser)
+    parser.set_defaults(bookings=20000, reviews=5000)
+    args = parser.parse_args()
+    
+    if args.url:
+        transport = HTTPTransport(args.url)
+    else:
+        app = make_app()
+        app.config['RATE_LIMIT_ENABLED'] = False
+        from models import db
+        with app.app_context():
+            seed_data.seed(db, args.providers, args.travelers, args.locations, args.bookings, args.reviews,
+                           args.seed)
+        transport = TestClientTransport(app)
+    
+    auth = login_all(transport)
+    scenarios = build_scenarios(args, threading.Lock(), random.Random(args.seed))
+    
+    summary = {}
+    print(f"{'scenario':<28} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'errors':>7}")
+    for blueprint in args.blueprints:
+        phase = summarize(run_phase(transport, scenarios[blueprint], auth, args.concurrency, args.duration),
+                          args.duration)
+        for name, result in phase.items():
+            print(f"{name:<28} {result['rps']:9.1f} {result['p50']:7.2f}ms {result['p95']:7.2f}ms "
+                  f"{result['p99']:7.2f}ms {result['errors']:7d}")
+        summary.update(phase)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+    
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(summary, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
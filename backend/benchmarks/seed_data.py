@@ -0,0 +1,160 @@
+"""Seed a database with synthetic users, locations, bookings and reviews.
+
+Locations are scattered around a handful of cities, so radius searches
+match a realistic share of them. Every seeded account (admin@bench.test,
+provider<N>@bench.test, traveler<N>@bench.test) has the password
+"password123". The same seed always produces the same data.
+
+Usage (from backend/):
+    python -m benchmarks.seed_data --locations 20000 --bookings 200000
+    python -m benchmarks.seed_data --database-url postgresql://localhost/vcloak_bench
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import make_app
+
+PASSWORD = 'password123'
+
+CITIES = [
+    (48.8566, 2.3522),    # Paris
+    (51.5074, -0.1278),   # London
+    (40.7128, -74.0060),  # New York
+    (35.6762, 139.6503),  # Tokyo
+    (19.0760, 72.8777),   # Mumbai
+    (-33.8688, 151.2093), # Sydney
+    (52.5200, 13.4050),   # Berlin
+    (41.9028, 12.4964),   # Rome
+]
+
+STATUSES = ['pending', 'confirmed', 'active', 'completed', 'cancelled']
+
+AMENITIES = ['secure', 'cctv', '24/7', 'indoor', 'insured', 'wheelchair']
+
+def add_arguments(parser):
+    """Add the row count options shared by the scripts that seed data"""
+    parser.add_argument('--providers', type=int, default=200)
+    parser.add_argument('--travelers', type=int, default=5000)
+    parser.add_argument('--locations', type=int, default=5000)
+    parser.add_argument('--bookings', type=int, default=50000)
+    parser.add_argument('--reviews', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+
+def seed(db, providers=200, travelers=5000, locations=5000, bookings=50000, reviews=10000, seed=42,
+         batch_size=10000):
+    """Insert synthetic rows in bulk into an empty database
+    
+    Returns the ids of the seeded admin, providers, travelers and locations.
+    """
+    from models import User, StorageLocation, Booking, Review
+    from utils.availability import rebuild_occupancy
+    from utils.analytics import rebuild_daily_stats
+    
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    
+    def created():
+        return now - timedelta(minutes=rng.randrange(365 * 24 * 60))
+    
+    def insert(model, rows):
+        for start in range(0, len(rows), batch_size):
+            db.session.execute(db.insert(model), rows[start:start + batch_size])
+    
+    # One real hash shared by every account keeps seeding fast but logins working
+    holder = User(email='seed')
+    holder.set_password(PASSWORD)
+    password_hash = holder.password_hash
+    
+    users = [{'email': 'admin@bench.test', 'name': 'Admin', 'role': 'admin'}]
+    users += [{'email': f'provider{i}@bench.test', 'name': f'Provider {i}', 'role': 'provider'}
+              for i in range(providers)]
+    users += [{'email': f'traveler{i}@bench.test', 'name': f'Traveler {i}', 'role': 'traveler'}
+              for i in range(travelers)]
+    for user in users:
+        user.update(password_hash=password_hash, verified=True, created_at=created())
+    insert(User, users)
+    
+    admin_id = db.session.query(User.id).filter_by(email='admin@bench.test').scalar()
+    provider_ids = list(range(admin_id + 1, admin_id + 1 + providers))
+    traveler_ids = list(range(admin_id + 1 + providers, admin_id + 1 + providers + travelers))
+    
+    first_location_id = (db.session.query(db.func.max(StorageLocation.id)).scalar() or 0) + 1
+    location_rows = []
+    for i in range(locations):
+        lat, lng = rng.choice(CITIES)
+        location_rows.append({
+            'provider_id': rng.choice(provider_ids),
+            'business_name': f'Location {i}',
+            'address': f'{i} Bench Street',
+            'latitude': lat + rng.uniform(-0.5, 0.5),
+            'longitude': lng + rng.uniform(-0.5, 0.5),
+            'capacity': rng.choice([5, 10, 20, 50]),
+            'price_per_hour': round(rng.uniform(1, 10), 2),
+            'amenities': rng.sample(AMENITIES, rng.randint(0, 4)),
+            'photos': [],
+            'verified': rng.random() < 0.8,
+            'active': rng.random() < 0.95,
+            'created_at': created()
+        })
+    insert(StorageLocation, location_rows)
+    location_ids = range(first_location_id, first_location_id + locations)
+    
+    first_booking_id = (db.session.query(db.func.max(Booking.id)).scalar() or 0) + 1
+    this_hour = now.replace(minute=0, second=0, microsecond=0)
+    booking_rows = []
+    for _ in range(bookings):
+        check_in = this_hour + timedelta(hours=rng.randrange(-24 * 180, 24 * 30))
+        hours = rng.randrange(1, 12)
+        booking_rows.append({
+            'traveler_id': rng.choice(traveler_ids),
+            'location_id': rng.choice(location_ids),
+            'check_in': check_in,
+            'check_out': check_in + timedelta(hours=hours),
+            'num_bags': rng.randint(1, 3),
+            'total_price': round(hours * 2.5, 2),
+            'status': rng.choice(STATUSES),
+            'payment_status': 'pending',
+            'created_at': created()
+        })
+    insert(Booking, booking_rows)
+    
+    review_rows = []
+    for offset in rng.sample(range(bookings), min(reviews, bookings)):
+        booking = booking_rows[offset]
+        review_rows.append({
+            'booking_id': first_booking_id + offset,
+            'traveler_id': booking['traveler_id'],
+            'location_id': booking['location_id'],
+            'rating': rng.randint(1, 5),
+            'comment': 'Seeded review',
+            'created_at': created()
+        })
+    insert(Review, review_rows)
+    
+    # Derived data the app keeps in step with bookings and reviews
+    StorageLocation.recompute_ratings()
+    rebuild_occupancy()
+    rebuild_daily_stats()
+    db.session.commit()
+    
+    return {'admin_id': admin_id, 'provider_ids': provider_ids, 'traveler_ids': traveler_ids,
+            'location_ids': list(location_ids)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', help='Defaults to a throwaway SQLite database')
+    add_arguments(parser)
+    args = parser.parse_args()
+    
+    app = make_app(args.database_url)
+    from models import db
+    
+    start = time.perf_counter()
+    with app.app_context():
+        seed(db, args.providers, args.travelers, args.locations, args.bookings, args.reviews, args.seed)
+    print(f"Seeded {app.config['SQLALCHEMY_DATABASE_URI']} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+import signal
+import threading
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from flask_migrate import stamp, upgrade
+from sqlalchemy import inspect
+from models import db, User, StorageLocation, Job, IdempotencyKey
+from utils.availability import rebuild_occupancy
+from utils.analytics import rebuild_daily_stats
+from utils.jobs import work
+
+# Schema that db.create_all() used to build on startup, before migrations
+BASELINE_REVISION = '0001_baseline'
+
+def init_db():
+    """Apply any pending migrations
+    
+    Databases created by the old create_all() on startup have tables but no
+    migration history, so they are stamped at the baseline first.
+    """
+    tables = inspect(db.engine).get_table_names()
+    if 'users' in tables and 'alembic_version' not in tables:
+        stamp(revision=BASELINE_REVISION)
+    upgrade()
+
+def seed_admin(email, password):
+    """Create the admin account unless it exists
+    
+    Returns the new user, or None if it already existed.
+    """
+    if User.query.filter_by(email=email).first():
+        return None
+    
+    admin = User(
+        email=email,
+        name='Admin',
+        role='admin',
+        verified=True
+    )
+    admin.set_password(password)
+    db.session.add(admin)
+    db.session.commit()
+    return admin
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Create or upgrade the database schema (safe to re-run)"""
+    init_db()
+    click.echo('Database is up to date')
+
+@click.command('seed-admin')
+@click.option('--email', help='Admin email (default: ADMIN_EMAIL)')
+@click.option('--password', help='Admin password (default: ADMIN_PASSWORD)')
+@with_appcontext
+def seed_admin_command(email, password):
+    """Create the default admin user if it doesn't exist"""
+    email = email or current_app.config['ADMIN_EMAIL']
+    password = password or current_app.config['ADMIN_PASSWORD']
+    
+    if seed_admin(email, password):
+        click.echo(f'Admin user created: {email}')
+    else:
+        click.echo(f'Admin user already exists: {email}')
+
+@click.command('recompute-ratings')
+@with_appcontext
+def recompute_ratings_command():
+    """Rebuild location ratings and review counts from the reviews table"""
+    updated = StorageLocation.recompute_ratings()
+    db.session.commit()
+    click.echo(f'Recomputed ratings for {updated} locations')
+
+@click.command('rebuild-occupancy')
+@click.option('--location-id', type=int, help='Only rebuild this location')
+@with_appcontext
+def rebuild_occupancy_command(location_id):
+    """Rebuild future hourly occupancy buckets from active bookings"""
+    written = rebuild_occupancy(location_id)
+    db.session.commit()
+    click.echo(f'Wrote {written} occupancy buckets')
+
+@click.command('backfill-analytics')
+@with_appcontext
+def backfill_analytics_command():
+    """Rebuild the daily analytics rollups from every booking"""
+    written = rebuild_daily_stats()
+    db.session.commit()
+    click.echo(f'Wrote {written} daily rollup rows')
+
+@click.command('run-worker')
+@click.option('--burst', is_flag=True, help='Exit once no jobs are due')
+@click.option('--batch-size', type=int, help='Jobs claimed per poll (default: JOB_BATCH_SIZE)')
+@click.option('--poll-interval', type=float, help='Seconds between polls when idle (default: JOB_POLL_INTERVAL)')
+@with_appcontext
+def run_worker_command(burst, batch_size, poll_interval):
+    """Run queued background jobs until interrupted"""
+    stopping = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stopping.set())
+    
+    click.echo('Worker started')
+    succeeded, failed = work(burst, batch_size, poll_interval, stopping=stopping)
+    click.echo(f'Worker stopped: {succeeded} jobs succeeded, {failed} failed')
+
+@click.command('prune-jobs')
+@click.option('--days', type=int, default=7, show_default=True, help='Keep finished jobs this many days')
+@with_appcontext
+def prune_jobs_command(days):
+    """Delete done and failed jobs older than --days"""
+    deleted = Job.query.filter(
+        Job.status.in_(('done', 'failed')),
+        Job.updated_at < datetime.utcnow() - timedelta(days=days)
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    click.echo(f'Deleted {deleted} jobs')
+
+@click.command('prune-idempotency-keys')
+@with_appcontext
+def prune_idempotency_keys_command():
+    """Delete expired Idempotency-Key responses"""
+    deleted = IdempotencyKey.query.filter(
+        IdempotencyKey.expires_at < datetime.utcnow()
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    click.echo(f'Deleted {deleted} idempotency keys')
+
+@click.command('sync-replicas')
+@with_appcontext
+def sync_replicas_command():
+    """Copy the SQLite primary over each SQLite replica, to try replica routing locally"""
+    replicas = current_app.config['SQLALCHEMY_BINDS']
+    if not replicas:
+        raise click.ClickException('No DATABASE_REPLICA_URLS configured')
+    if db.engine.dialect.name != 'sqlite' or any(db.engines[name].dialect.name != 'sqlite' for name in replicas):
+        raise click.ClickException('Only SQLite replicas can be synced; use PostgreSQL replication otherwise')
+    
+    source = db.engine.raw_connection()
+    try:
+        for name in replicas:
+            target = db.engines[name].raw_connection()
+            try:
+                source.driver_connection.backup(target.driver_connection)
+            finally:
+                target.close()
+            click.echo(f'Synced {name}')
+    finally:
+        source.close()
+
+def register_commands(app):
+    """Register the Flask CLI commands"""
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(seed_admin_command)
+    app.cli.add_command(recompute_ratings_command)
+    app.cli.add_command(rebuild_occupancy_command)
+    app.cli.add_command(backfill_analytics_command)
+    app.cli.add_command(run_worker_command)
+    app.cli.add_command(prune_jobs_command)
+    app.cli.add_command(prune_idempotency_keys_command)
+    app.cli.add_command(sync_replicas_command)
@@ -1,9 +1,18 @@
 import os
+import tempfile
 from datetime import timedelta
 from dotenv import load_dotenv
 
 load_dotenv()
 
+def database_uri(url):
+    """Use the psycopg3 driver for postgres:// and postgresql:// URLs"""
+    if url.startswith('postgres://'):
+        return url.replace('postgres://', 'postgresql+psycopg://', 1)
+    if url.startswith('postgresql://'):
+        return url.replace('postgresql://', 'postgresql+psycopg://', 1)
+    return url
+
 class Config:
     """Base configuration"""
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -11,22 +20,92 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    # Handle both DATABASE_URL and postgres:// vs postgresql://
-    database_url = os.getenv('DATABASE_URL', 'sqlite:///vcloak.db')
-    # Convert to postgresql+psycopg:// for psycopg3 compatibility
-    if database_url.startswith('postgres://'):
-        database_url = database_url.replace('postgres://', 'postgresql+psycopg://', 1)
-    elif database_url.startswith('postgresql://'):
-        database_url = database_url.replace('postgresql://', 'postgresql+psycopg://', 1)
-    SQLALCHEMY_DATABASE_URI = database_url
+    SQLALCHEMY_DATABASE_URI = database_uri(os.getenv('DATABASE_URL', 'sqlite:///vcloak.db'))
+    
+    # Read replicas (comma-separated URLs) serving GET requests; unset sends everything to the primary
+    DATABASE_REPLICA_URLS = [database_uri(url.strip()) for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    SQLALCHEMY_BINDS = {f'replica_{i}': url for i, url in enumerate(DATABASE_REPLICA_URLS)}
+    # Seconds after a write that the writer's reads stay on the primary; keep above the usual replica lag
+    REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 10))
+    
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
     
+    # Account created by `flask seed-admin`
+    ADMIN_EMAIL = os.getenv('ADMIN_EMAIL', 'admin@vcloak.com')
+    ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'admin123')
+    
+    # Keyset pagination for listing endpoints
+    PAGE_SIZE_DEFAULT = int(os.getenv('PAGE_SIZE_DEFAULT', 100))
+    PAGE_SIZE_MAX = int(os.getenv('PAGE_SIZE_MAX', 500))
+    
+    # Seconds each worker trusts its cached users.token_version; bounds how long a role change takes to apply
+    TOKEN_VERSION_CACHE_TTL = int(os.getenv('TOKEN_VERSION_CACHE_TTL', 5))
+    
+    # Seconds to serve cached admin stats before recomputing (0 disables)
+    ADMIN_STATS_TTL = int(os.getenv('ADMIN_STATS_TTL', 30))
+    
+    # Response cache for public read endpoints: memory (per worker), redis (shared) or null
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', 60))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 2048))
+    
+    # Password hashing: bcrypt cost and the bounded pool it runs on
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+    # Half the cores by default, leaving the rest for other requests during a login burst
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+    PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', 16))  # Waiting hashes beyond the workers
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 5))  # Seconds to wait for a free slot
+    
+    # Token-bucket rate limits: memory (per worker) or redis (shared) backend
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_REDIS_URL = os.getenv('RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+    # Endpoint or blueprint name -> {key: 'count/period'}; endpoint entries take precedence
+    RATE_LIMITS = {
+        'auth.login': {'ip': '20/minute', 'email': '5/minute'},
+        'auth.register': {'ip': '10/minute'}
+    }
+    
+    # Reverse proxies in front of the app so client IPs come from X-Forwarded-For; production defaults to 1 (Render)
+    TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', 0))
+    
+    # Longest booking and furthest check-in accepted; each booked hour is one occupancy row
+    BOOKING_MAX_DAYS = int(os.getenv('BOOKING_MAX_DAYS', 30))
+    BOOKING_MAX_ADVANCE_DAYS = int(os.getenv('BOOKING_MAX_ADVANCE_DAYS', 365))
+    
+    # Largest batch accepted by the bulk endpoints
+    BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', 1000))
+    
+    # Stored responses of POSTs sent with an Idempotency-Key header, replayed on retries
+    IDEMPOTENCY_KEY_TTL = timedelta(hours=int(os.getenv('IDEMPOTENCY_KEY_TTL_HOURS', 24)))
+    IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv('IDEMPOTENCY_LOCK_TIMEOUT', 60))  # Seconds before an unfinished key is reclaimed
+    
+    # Background jobs run by `flask run-worker`; JOBS_RUN_INLINE runs them at the end of the request instead
+    JOBS_RUN_INLINE = os.getenv('JOBS_RUN_INLINE', 'false').lower() == 'true'
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 5))
+    JOB_BACKOFF_BASE = float(os.getenv('JOB_BACKOFF_BASE', 2))  # Seconds before the first retry, doubling
+    JOB_BACKOFF_MAX = float(os.getenv('JOB_BACKOFF_MAX', 600))
+    JOB_LOCK_TIMEOUT = int(os.getenv('JOB_LOCK_TIMEOUT', 300))  # Seconds before a running job is presumed lost
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 1))
+    JOB_BATCH_SIZE = int(os.getenv('JOB_BATCH_SIZE', 20))
+    
+    # Per-request instrumentation: Server-Timing headers, /metrics and slow request logging
+    INSTRUMENTATION_ENABLED = os.getenv('INSTRUMENTATION_ENABLED', 'false').lower() == 'true'
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # Bearer token required by /metrics when set
+    SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', 500))
+    # Share of requests run under cProfile (0 disables); slow ones are dumped to PROFILE_DIR
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'vcloak-profiles'))
+    
     # Database connection pool settings to prevent timeouts
+    # Sized per worker process; keep GUNICORN_THREADS within pool_size + max_overflow
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_pre_ping': True,  # Verify connections before using
         'pool_recycle': 300,    # Recycle connections after 5 minutes
-        'pool_size': 10,        # Connection pool size
-        'max_overflow': 20      # Max connections beyond pool_size
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),        # Connection pool size
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),  # Max connections beyond pool_size
+        'pool_timeout': 10      # Seconds to wait for a free connection
     }
 
 class DevelopmentConfig(Config):
@@ -38,9 +117,18 @@ class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     SQLALCHEMY_ECHO = False
+    TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', 1))
+
+class TestingConfig(Config):
+    """Test suite configuration; set DATABASE_URL to a throwaway database before importing"""
+    TESTING = True
+    SQLALCHEMY_ECHO = False
+    RATE_LIMIT_ENABLED = False
+    BCRYPT_ROUNDS = 4
 
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
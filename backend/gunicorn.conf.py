@@ -0,0 +1,31 @@
+"""Gunicorn settings, tunable from the environment.
+
+Threaded (gthread) workers are the default: each worker serves several
+requests at once, so a request waiting on a database round trip no longer
+blocks the whole worker. Database I/O and bcrypt release the GIL, so the
+threads overlap well. Set GUNICORN_WORKER_CLASS=sync for the old behaviour.
+
+Keep GUNICORN_THREADS at or below DB_POOL_SIZE + DB_MAX_OVERFLOW so every
+thread can get a connection without waiting.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 8)) if worker_class == 'gthread' else 1
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to bound memory growth
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+# Each worker builds its own app and connection pool after forking
+preload_app = False
+
+accesslog = '-'
+errorlog = '-'
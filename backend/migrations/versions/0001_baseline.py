@@ -0,0 +1,99 @@
+"""Baseline schema, as created by db.create_all() before migrations
+
+Databases created that way are stamped at this revision by `flask init-db`.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('role', sa.String(length=20), nullable=False),
+        sa.Column('verified', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'storage_locations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('provider_id', sa.Integer(), nullable=False),
+        sa.Column('business_name', sa.String(length=200), nullable=False),
+        sa.Column('address', sa.String(length=500), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+        sa.Column('capacity', sa.Integer(), nullable=False),
+        sa.Column('price_per_hour', sa.Float(), nullable=False),
+        sa.Column('amenities', sa.Text(), nullable=True),
+        sa.Column('photos', sa.Text(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('rating', sa.Float(), nullable=True),
+        sa.Column('total_reviews', sa.Integer(), nullable=True),
+        sa.Column('verified', sa.Boolean(), nullable=True),
+        sa.Column('active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['provider_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table(
+        'bookings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('traveler_id', sa.Integer(), nullable=False),
+        sa.Column('location_id', sa.Integer(), nullable=False),
+        sa.Column('check_in', sa.DateTime(), nullable=False),
+        sa.Column('check_out', sa.DateTime(), nullable=False),
+        sa.Column('num_bags', sa.Integer(), nullable=False),
+        sa.Column('total_price', sa.Float(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('payment_status', sa.String(length=20), nullable=True),
+        sa.Column('special_instructions', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['location_id'], ['storage_locations.id']),
+        sa.ForeignKeyConstraint(['traveler_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table(
+        'reviews',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('booking_id', sa.Integer(), nullable=False),
+        sa.Column('traveler_id', sa.Integer(), nullable=False),
+        sa.Column('location_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['booking_id'], ['bookings.id']),
+        sa.ForeignKeyConstraint(['location_id'], ['storage_locations.id']),
+        sa.ForeignKeyConstraint(['traveler_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('booking_id')
+    )
+
+
+def downgrade():
+    op.drop_table('reviews')
+    op.drop_table('bookings')
+    op.drop_table('storage_locations')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
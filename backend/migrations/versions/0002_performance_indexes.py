@@ -0,0 +1,114 @@
+"""Performance indexes, occupancy table and native JSON columns
+
+Indexes match the filters and keyset orderings of the route queries.
+Occupancy is filled from the bookings holding slots, as
+`flask rebuild-occupancy` does, so they keep counting against capacity.
+
+Revision ID: 0002_performance_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-17 18:47:32.900030
+
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_performance_indexes'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_users_role_created', 'users', ['role', 'created_at', 'id']),
+    ('ix_users_created', 'users', ['created_at', 'id']),
+    ('ix_storage_locations_lat_lng', 'storage_locations', ['latitude', 'longitude']),
+    ('ix_storage_locations_active_created', 'storage_locations', ['active', 'created_at', 'id']),
+    ('ix_storage_locations_active_verified_created', 'storage_locations',
+     ['active', 'verified', 'created_at', 'id']),
+    ('ix_storage_locations_provider', 'storage_locations', ['provider_id']),
+    ('ix_bookings_traveler_created', 'bookings', ['traveler_id', 'created_at', 'id']),
+    ('ix_bookings_location_check_in', 'bookings', ['location_id', 'check_in', 'id']),
+    ('ix_bookings_created', 'bookings', ['created_at', 'id']),
+    ('ix_bookings_status_created', 'bookings', ['status', 'created_at', 'id']),
+    ('ix_bookings_overlap', 'bookings', ['location_id', 'check_in', 'check_out', 'status']),
+    ('ix_reviews_location_created', 'reviews', ['location_id', 'created_at']),
+]
+
+JSON_COLUMNS = ('amenities', 'photos')
+
+OCCUPYING_STATUSES = ('pending', 'confirmed', 'active')
+
+bookings = sa.table(
+    'bookings',
+    sa.column('location_id', sa.Integer),
+    sa.column('check_in', sa.DateTime),
+    sa.column('check_out', sa.DateTime),
+    sa.column('num_bags', sa.Integer),
+    sa.column('status', sa.String)
+)
+
+
+def backfill_occupancy(occupancy):
+    """Insert the future hourly buckets held by pending, confirmed and active bookings"""
+    now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    rows = op.get_bind().execute(
+        sa.select(bookings.c.location_id, bookings.c.check_in, bookings.c.check_out, bookings.c.num_bags)
+        .where(bookings.c.check_out > now, bookings.c.status.in_(OCCUPYING_STATUSES))
+    )
+
+    totals = Counter()
+    for location_id, check_in, check_out, num_bags in rows:
+        bucket = max(check_in.replace(minute=0, second=0, microsecond=0), now)
+        while bucket < check_out:
+            totals[(location_id, bucket)] += num_bags
+            bucket += timedelta(hours=1)
+
+    if totals:
+        op.bulk_insert(occupancy, [
+            {'location_id': location_id, 'bucket_start': bucket, 'bags': bags}
+            for (location_id, bucket), bags in totals.items()
+        ])
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+    occupancy = op.create_table(
+        'location_occupancy',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('location_id', sa.Integer(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('bags', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['location_id'], ['storage_locations.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('location_id', 'bucket_start', name='uq_location_occupancy_bucket')
+    )
+    backfill_occupancy(occupancy)
+
+    # amenities/photos held JSON as text; empty strings aren't valid JSON
+    for column in JSON_COLUMNS:
+        op.execute(f"UPDATE storage_locations SET {column} = NULL WHERE {column} = ''")
+        if op.get_bind().dialect.name == 'postgresql':
+            op.execute(f'ALTER TABLE storage_locations ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb')
+        else:
+            # Only the declared type changes; SQLite stores JSON as text either way
+            with op.batch_alter_table('storage_locations', recreate='always') as batch_op:
+                batch_op.alter_column(column, existing_type=sa.Text(), type_=sa.JSON())
+
+
+def downgrade():
+    for column in JSON_COLUMNS:
+        if op.get_bind().dialect.name == 'postgresql':
+            op.execute(f'ALTER TABLE storage_locations ALTER COLUMN {column} TYPE TEXT USING {column}::text')
+        else:
+            with op.batch_alter_table('storage_locations', recreate='always') as batch_op:
+                batch_op.alter_column(column, existing_type=sa.JSON(), type_=sa.Text())
+
+    op.drop_table('location_occupancy')
+
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,53 @@
+"""Daily booking rollups per location for the analytics endpoints
+
+Existing bookings are rolled up in one INSERT ... SELECT, as
+`flask backfill-analytics` does.
+
+Revision ID: 0003_location_daily_stats
+Revises: 0002_performance_indexes
+Create Date: 2026-10-17 18:56:57.298750
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_location_daily_stats'
+down_revision = '0002_performance_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('location_daily_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('bookings', sa.Integer(), nullable=False),
+    sa.Column('cancelled', sa.Integer(), nullable=False),
+    sa.Column('bags', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['location_id'], ['storage_locations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('location_id', 'day', name='uq_location_daily_stats_day')
+    )
+    with op.batch_alter_table('location_daily_stats', schema=None) as batch_op:
+        batch_op.create_index('ix_location_daily_stats_day', ['day'], unique=False)
+
+    op.execute("""
+        INSERT INTO location_daily_stats (location_id, day, bookings, cancelled, bags, revenue)
+        SELECT location_id, date(check_in), count(id),
+               sum(CASE WHEN status = 'cancelled' THEN 1 ELSE 0 END),
+               sum(CASE WHEN status = 'cancelled' THEN 0 ELSE num_bags END),
+               sum(CASE WHEN status = 'cancelled' THEN 0.0 ELSE coalesce(total_price, 0.0) END)
+        FROM bookings
+        GROUP BY location_id, date(check_in)
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('location_daily_stats', schema=None) as batch_op:
+        batch_op.drop_index('ix_location_daily_stats_day')
+
+    op.drop_table('location_daily_stats')
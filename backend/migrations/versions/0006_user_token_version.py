@@ -0,0 +1,26 @@
+"""Per-user token version, bumped to make issued access tokens re-check the user
+
+Revision ID: 0006_user_token_version
+Revises: 0005_idempotency_keys
+Create Date: 2026-10-17 19:23:21.452512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_user_token_version'
+down_revision = '0005_idempotency_keys'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
@@ -1,10 +1,15 @@
 from flask_sqlalchemy import SQLAlchemy
+from .routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 from .user import User
 from .storage_location import StorageLocation
 from .booking import Booking
 from .review import Review
+from .occupancy import LocationOccupancy
+from .daily_stats import LocationDailyStats
+from .job import Job
+from .idempotency_key import IdempotencyKey
 
-__all__ = ['db', 'User', 'StorageLocation', 'Booking', 'Review']
+__all__ = ['db', 'User', 'StorageLocation', 'Booking', 'Review', 'LocationOccupancy', 'LocationDailyStats', 'Job', 'IdempotencyKey']
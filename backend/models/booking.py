@@ -1,8 +1,31 @@
 from datetime import datetime
+from sqlalchemy.orm.attributes import set_committed_value
 from . import db
 
 class Booking(db.Model):
     __tablename__ = 'bookings'
+    __table_args__ = (
+        # Keyset pagination of traveler, provider and admin listings
+        db.Index('ix_bookings_traveler_created', 'traveler_id', 'created_at', 'id'),
+        db.Index('ix_bookings_location_check_in', 'location_id', 'check_in', 'id'),
+        db.Index('ix_bookings_created', 'created_at', 'id'),
+        # Admin listing filtered by status
+        db.Index('ix_bookings_status_created', 'status', 'created_at', 'id'),
+        # Overlapping bookings for a location and time window
+        db.Index('ix_bookings_overlap', 'location_id', 'check_in', 'check_out', 'status'),
+    )
+    
+    STATUSES = ('pending', 'confirmed', 'active', 'completed', 'cancelled')
+    # Statuses that hold bag slots at the location
+    OCCUPYING_STATUSES = ('pending', 'confirmed', 'active')
+    # Allowed status changes; completed and cancelled are final
+    TRANSITIONS = {
+        'pending': ('confirmed', 'cancelled'),
+        'confirmed': ('active', 'cancelled'),
+        'active': ('completed',),
+        'completed': (),
+        'cancelled': ()
+    }
     
     id = db.Column(db.Integer, primary_key=True)
     traveler_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -20,21 +43,61 @@ class Booking(db.Model):
     # Relationship
     review = db.relationship('Review', backref='booking', uselist=False, lazy=True)
     
+    @classmethod
+    def overlapping(cls, location_id, start, end):
+        """Query bookings at a location that hold slots at any time in [start, end)"""
+        return cls.query.filter(
+            cls.location_id == location_id,
+            cls.check_in < end,
+            cls.check_out > start,
+            cls.status.in_(cls.OCCUPYING_STATUSES)
+        )
+    
+    @classmethod
+    def transition_error(cls, old_status, new_status):
+        """Get why a booking can't move from old_status to new_status, or None if it can"""
+        if new_status not in cls.STATUSES:
+            return f"status must be one of: {', '.join(cls.STATUSES)}"
+        if new_status not in cls.TRANSITIONS.get(old_status, ()):
+            return f'Cannot change booking status from {old_status} to {new_status}'
+        return None
+    
+    def transition_to(self, new_status):
+        """Move the booking from its loaded status to new_status
+        
+        Runs as one conditional UPDATE ... WHERE id = ? AND status = ?, so a
+        concurrent change can't be overwritten. Returns False, leaving the
+        row alone, if the status changed since the booking was loaded.
+        """
+        now = datetime.utcnow()
+        result = db.session.execute(
+            db.update(Booking)
+            .where(Booking.id == self.id, Booking.status == self.status)
+            .values(status=new_status, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            return False
+        
+        set_committed_value(self, 'status', new_status)
+        set_committed_value(self, 'updated_at', now)
+        return True
+    
     def to_dict(self):
         """Convert booking to dictionary"""
         return {
             'id': self.id,
             'traveler_id': self.traveler_id,
             'location_id': self.location_id,
-            'check_in': self.check_in.isoformat(),
-            'check_out': self.check_out.isoformat(),
+            'check_in': self.check_in,
+            'check_out': self.check_out,
             'num_bags': self.num_bags,
             'total_price': self.total_price,
             'status': self.status,
             'payment_status': self.payment_status,
             'special_instructions': self.special_instructions,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     def __repr__(self):
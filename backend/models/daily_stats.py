@@ -0,0 +1,35 @@
+from . import db
+
+class LocationDailyStats(db.Model):
+    """Booking totals of a location for one day, keyed by check-in date (UTC)
+    
+    Bags and revenue only count bookings that aren't cancelled.
+    """
+    __tablename__ = 'location_daily_stats'
+    __table_args__ = (
+        db.UniqueConstraint('location_id', 'day', name='uq_location_daily_stats_day'),
+        # Platform-wide series across every location
+        db.Index('ix_location_daily_stats_day', 'day'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    location_id = db.Column(db.Integer, db.ForeignKey('storage_locations.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    bookings = db.Column(db.Integer, nullable=False, default=0)
+    cancelled = db.Column(db.Integer, nullable=False, default=0)
+    bags = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0.0)
+    
+    def to_dict(self):
+        """Convert daily stats to dictionary"""
+        return {
+            'location_id': self.location_id,
+            'day': self.day,
+            'bookings': self.bookings,
+            'cancelled': self.cancelled,
+            'bags': self.bags,
+            'revenue': self.revenue
+        }
+    
+    def __repr__(self):
+        return f'<LocationDailyStats {self.location_id} @ {self.day}>'
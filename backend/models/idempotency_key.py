@@ -0,0 +1,24 @@
+from datetime import datetime
+from . import db
+
+class IdempotencyKey(db.Model):
+    """Stored response of a request sent with an Idempotency-Key header, replayed on retries"""
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (
+        # The one lookup a retried request costs
+        db.UniqueConstraint('user_id', 'key', name='uq_idempotency_keys_user_key'),
+        # Pruning expired keys
+        db.Index('ix_idempotency_keys_expires_at', 'expires_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    key = db.Column(db.String(255), nullable=False)
+    request_hash = db.Column(db.String(64), nullable=False)  # SHA-256 of method, path and body
+    status_code = db.Column(db.Integer)  # None while the first request is still running
+    response_body = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f'<IdempotencyKey {self.user_id}:{self.key} - {self.status_code}>'
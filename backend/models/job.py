@@ -0,0 +1,46 @@
+from datetime import datetime
+from . import db
+
+class Job(db.Model):
+    """Side work queued by a request and run after commit by `flask run-worker`"""
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        # Workers poll for due pending jobs, oldest first
+        db.Index('ix_jobs_status_run_at', 'status', 'run_at'),
+    )
+    
+    STATUSES = ('pending', 'running', 'done', 'failed')
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    # Enqueueing the same key twice keeps only the first job
+    idempotency_key = db.Column(db.String(200), unique=True)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # UTC, not before
+    locked_by = db.Column(db.String(100))
+    locked_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert job to dictionary"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'payload': self.payload,
+            'idempotency_key': self.idempotency_key,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'run_at': self.run_at,
+            'last_error': self.last_error,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
+    
+    def __repr__(self):
+        return f'<Job {self.id} {self.name} - {self.status}>'
@@ -0,0 +1,24 @@
+from . import db
+
+class LocationOccupancy(db.Model):
+    """Bags held at a location during one hourly bucket"""
+    __tablename__ = 'location_occupancy'
+    __table_args__ = (
+        db.UniqueConstraint('location_id', 'bucket_start', name='uq_location_occupancy_bucket'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    location_id = db.Column(db.Integer, db.ForeignKey('storage_locations.id'), nullable=False)
+    bucket_start = db.Column(db.DateTime, nullable=False)  # UTC, truncated to the hour
+    bags = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self):
+        """Convert occupancy bucket to dictionary"""
+        return {
+            'location_id': self.location_id,
+            'bucket_start': self.bucket_start,
+            'bags': self.bags
+        }
+    
+    def __repr__(self):
+        return f'<LocationOccupancy {self.location_id} @ {self.bucket_start}: {self.bags}>'
@@ -3,6 +3,10 @@ from . import db
 
 class Review(db.Model):
     __tablename__ = 'reviews'
+    __table_args__ = (
+        # A location's reviews, newest first, and rating aggregates per location
+        db.Index('ix_reviews_location_created', 'location_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     booking_id = db.Column(db.Integer, db.ForeignKey('bookings.id'), nullable=False, unique=True)
@@ -21,7 +25,7 @@ class Review(db.Model):
             'location_id': self.location_id,
             'rating': self.rating,
             'comment': self.comment,
-            'created_at': self.created_at.isoformat(),
+            'created_at': self.created_at,
             'traveler_name': self.reviewer.name if self.reviewer else None
         }
     
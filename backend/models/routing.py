@@ -0,0 +1,22 @@
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select
+from sqlalchemy.sql.dml import UpdateBase
+
+class RoutingSession(Session):
+    """Session that runs a request's plain SELECTs on the read replica it was assigned
+    
+    The replica bind key is chosen per request in g.db_replica (see
+    utils.replicas). Flushes, INSERT/UPDATE/DELETE and SELECT ... FOR UPDATE
+    go to the primary and pin the rest of the request there, so a request
+    always reads its own writes. Outside requests everything uses the primary.
+    """
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            locks_rows = isinstance(clause, Select) and clause._for_update_arg is not None
+            if self._flushing or isinstance(clause, UpdateBase) or locks_rows:
+                g.pop('db_replica', None)
+                g.db_wrote = True
+            elif isinstance(clause, Select) and g.get('db_replica') is not None:
+                return self._db.engines[g.db_replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -1,8 +1,23 @@
 from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import JSONB
 from . import db
 
+# Native JSON column: JSONB on PostgreSQL, JSON (stored as text) elsewhere
+JSONList = db.JSON().with_variant(JSONB(), 'postgresql')
+
 class StorageLocation(db.Model):
     __tablename__ = 'storage_locations'
+    __table_args__ = (
+        # Bounding-box prefilter for radius searches
+        db.Index('ix_storage_locations_lat_lng', 'latitude', 'longitude'),
+        # Keyset pagination of active listings
+        db.Index('ix_storage_locations_active_created', 'active', 'created_at', 'id'),
+        # Keyset pagination of verified listings (?verified=true)
+        db.Index('ix_storage_locations_active_verified_created', 'active', 'verified', 'created_at', 'id'),
+        # A provider's own locations
+        db.Index('ix_storage_locations_provider', 'provider_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     provider_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -12,8 +27,8 @@ class StorageLocation(db.Model):
     longitude = db.Column(db.Float, nullable=False)
     capacity = db.Column(db.Integer, nullable=False, default=10)
     price_per_hour = db.Column(db.Float, nullable=False)
-    amenities = db.Column(db.Text)  # JSON string: ["secure", "cctv", "24/7", "indoor"]
-    photos = db.Column(db.Text)  # JSON string: ["url1", "url2"]
+    amenities = db.Column(JSONList)  # ["secure", "cctv", "24/7", "indoor"]
+    photos = db.Column(JSONList)  # ["url1", "url2"]
     description = db.Column(db.Text)
     rating = db.Column(db.Float, default=0.0)
     total_reviews = db.Column(db.Integer, default=0)
@@ -25,27 +40,65 @@ class StorageLocation(db.Model):
     bookings = db.relationship('Booking', backref='location', lazy=True)
     reviews = db.relationship('Review', backref='location', lazy=True)
     
-    def to_dict(self):
-        """Convert location to dictionary"""
-        import json
+    @classmethod
+    def add_review_rating(cls, location_id, rating):
+        """Fold one new review into a location's rating with a single atomic UPDATE"""
+        current_rating = func.coalesce(cls.rating, 0.0)
+        current_total = func.coalesce(cls.total_reviews, 0)
+        db.session.execute(
+            db.update(cls)
+            .where(cls.id == location_id)
+            .values(
+                rating=(current_rating * current_total + rating) / (current_total + 1),
+                total_reviews=current_total + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
+    @classmethod
+    def recompute_ratings(cls):
+        """Rebuild rating and total_reviews for every location from its reviews in one pass"""
+        from .review import Review
+        
+        average = db.select(func.avg(Review.rating)).where(Review.location_id == cls.id).scalar_subquery()
+        count = db.select(func.count(Review.id)).where(Review.location_id == cls.id).scalar_subquery()
+        result = db.session.execute(
+            db.update(cls)
+            .values(rating=func.coalesce(average, 0.0), total_reviews=count)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    @classmethod
+    def projected(cls, query):
+        """Select plain column rows instead of ORM objects, for serializing listings with row_to_dict"""
+        return query.with_entities(*cls.__table__.columns)
+    
+    @staticmethod
+    def row_to_dict(row):
+        """Convert a location row or instance to dictionary"""
         return {
-            'id': self.id,
-            'provider_id': self.provider_id,
-            'business_name': self.business_name,
-            'address': self.address,
-            'latitude': self.latitude,
-            'longitude': self.longitude,
-            'capacity': self.capacity,
-            'price_per_hour': self.price_per_hour,
-            'amenities': json.loads(self.amenities) if self.amenities else [],
-            'photos': json.loads(self.photos) if self.photos else [],
-            'description': self.description,
-            'rating': round(self.rating, 1),
-            'total_reviews': self.total_reviews,
-            'verified': self.verified,
-            'active': self.active,
-            'created_at': self.created_at.isoformat()
+            'id': row.id,
+            'provider_id': row.provider_id,
+            'business_name': row.business_name,
+            'address': row.address,
+            'latitude': row.latitude,
+            'longitude': row.longitude,
+            'capacity': row.capacity,
+            'price_per_hour': row.price_per_hour,
+            'amenities': row.amenities or [],
+            'photos': row.photos or [],
+            'description': row.description,
+            'rating': round(row.rating, 1),
+            'total_reviews': row.total_reviews,
+            'verified': row.verified,
+            'active': row.active,
+            'created_at': row.created_at
         }
     
+    def to_dict(self):
+        """Convert location to dictionary"""
+        return self.row_to_dict(self)
+    
     def __repr__(self):
         return f'<StorageLocation {self.business_name}>'
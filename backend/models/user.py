@@ -1,9 +1,14 @@
 from datetime import datetime
 from . import db
-import bcrypt
+from utils.passwords import hash_password, verify_password, needs_rehash
 
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Keyset pagination of admin user listings
+        db.Index('ix_users_role_created', 'role', 'created_at', 'id'),
+        db.Index('ix_users_created', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
@@ -12,6 +17,8 @@ class User(db.Model):
     phone = db.Column(db.String(20))
     role = db.Column(db.String(20), nullable=False, default='traveler')  # traveler, provider, admin
     verified = db.Column(db.Boolean, default=False)
+    # Bumped by mark_user_changed; access tokens carry the version they were issued at
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -21,11 +28,15 @@ class User(db.Model):
     
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
         """Verify password"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return verify_password(password, self.password_hash)
+    
+    def password_needs_rehash(self):
+        """Check whether the password hash uses an outdated bcrypt cost"""
+        return needs_rehash(self.password_hash)
     
     def to_dict(self, include_sensitive=False):
         """Convert user to dictionary"""
@@ -36,7 +47,7 @@ class User(db.Model):
             'phone': self.phone,
             'role': self.role,
             'verified': self.verified,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at
         }
         return data
     
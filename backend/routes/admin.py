@@ -1,37 +1,60 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload, selectinload
 from models import db, User, StorageLocation, Booking
-from utils.auth_helpers import role_required
+from utils.auth_helpers import role_required, mark_user_changed
+from utils.pagination import parse_page_args, paginate
+from utils.cache import TTLCache, invalidate_location
+from utils.streaming import is_streaming_request, stream_list
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 
+# Short-lived cache so dashboard polling doesn't recount every table
+stats_cache = TTLCache()
+
+def _booking_with_details(booking):
+    """Serialize a booking with its location and traveler"""
+    booking_dict = booking.to_dict()
+    booking_dict['location'] = booking.location.to_dict()
+    booking_dict['traveler'] = booking.traveler.to_dict()
+    return booking_dict
+
+def _compute_stats():
+    """Compute platform statistics with one grouped query per table"""
+    users_by_role = dict(db.session.query(User.role, func.count(User.id)).group_by(User.role).all())
+    locations_by_verified = dict(
+        db.session.query(StorageLocation.verified, func.count(StorageLocation.id))
+        .group_by(StorageLocation.verified).all()
+    )
+    bookings_by_status = dict(db.session.query(Booking.status, func.count(Booking.id)).group_by(Booking.status).all())
+    
+    total_locations = sum(locations_by_verified.values())
+    verified_locations = locations_by_verified.get(True, 0)
+    
+    return {
+        'total_users': sum(users_by_role.values()),
+        'total_travelers': users_by_role.get('traveler', 0),
+        'total_providers': users_by_role.get('provider', 0),
+        'total_locations': total_locations,
+        'verified_locations': verified_locations,
+        'pending_verification': total_locations - verified_locations,
+        'total_bookings': sum(bookings_by_status.values()),
+        'active_bookings': bookings_by_status.get('active', 0),
+        'completed_bookings': bookings_by_status.get('completed', 0)
+    }
+
 @admin_bp.route('/stats', methods=['GET'])
 @jwt_required()
 @role_required('admin')
 def get_stats():
     """Get platform statistics"""
-    total_users = User.query.count()
-    total_travelers = User.query.filter_by(role='traveler').count()
-    total_providers = User.query.filter_by(role='provider').count()
-    total_locations = StorageLocation.query.count()
-    verified_locations = StorageLocation.query.filter_by(verified=True).count()
-    total_bookings = Booking.query.count()
-    active_bookings = Booking.query.filter_by(status='active').count()
-    completed_bookings = Booking.query.filter_by(status='completed').count()
+    stats = stats_cache.get('stats')
+    if stats is None:
+        stats = _compute_stats()
+        stats_cache.set('stats', stats, current_app.config['ADMIN_STATS_TTL'])
     
-    return jsonify({
-        'stats': {
-            'total_users': total_users,
-            'total_travelers': total_travelers,
-            'total_providers': total_providers,
-            'total_locations': total_locations,
-            'verified_locations': verified_locations,
-            'pending_verification': total_locations - verified_locations,
-            'total_bookings': total_bookings,
-            'active_bookings': active_bookings,
-            'completed_bookings': completed_bookings
-        }
-    }), 200
+    return jsonify({'stats': stats}), 200
 
 @admin_bp.route('/providers', methods=['GET'])
 @jwt_required()
@@ -39,15 +62,20 @@ def get_stats():
 def get_providers():
     """Get all providers with their locations"""
     verified = request.args.get('verified')
+    order = (User.created_at, User.id)
+    limit, cursor, error = parse_page_args(*order)
+    if error:
+        return jsonify({'error': error}), 400
     
-    query = User.query.filter_by(role='provider')
+    # Load every provider's locations in one extra query
+    query = User.query.options(selectinload(User.storage_locations)).filter_by(role='provider')
     
-    providers = query.all()
+    providers, next_cursor = paginate(query, limit, cursor, *order)
     
     providers_data = []
     for provider in providers:
         provider_dict = provider.to_dict()
-        locations = StorageLocation.query.filter_by(provider_id=provider.id).all()
+        locations = provider.storage_locations
         
         if verified == 'false':
             locations = [loc for loc in locations if not loc.verified]
@@ -57,7 +85,7 @@ def get_providers():
         provider_dict['locations'] = [loc.to_dict() for loc in locations]
         providers_data.append(provider_dict)
     
-    return jsonify({'providers': providers_data}), 200
+    return jsonify({'providers': providers_data, 'next_cursor': next_cursor}), 200
 
 @admin_bp.route('/providers/<int:provider_id>/verify', methods=['PUT'])
 @jwt_required()
@@ -77,6 +105,7 @@ def verify_provider(provider_id):
     
     # Optionally verify all their locations
     data = request.get_json() or {}
+    locations = []
     if data.get('verify_locations', False):
         locations = StorageLocation.query.filter_by(provider_id=provider_id).all()
         for location in locations:
@@ -84,6 +113,9 @@ def verify_provider(provider_id):
     
     try:
         db.session.commit()
+        stats_cache.delete('stats')
+        for location in locations:
+            invalidate_location(location.id)
         return jsonify({'message': 'Provider verified successfully'}), 200
     except Exception as e:
         db.session.rollback()
@@ -103,6 +135,8 @@ def verify_location(location_id):
     
     try:
         db.session.commit()
+        stats_cache.delete('stats')
+        invalidate_location(location.id)
         return jsonify({'message': 'Location verified successfully'}), 200
     except Exception as e:
         db.session.rollback()
@@ -114,15 +148,27 @@ def verify_location(location_id):
 def get_users():
     """Get all users"""
     role = request.args.get('role')
+    order = (User.created_at, User.id)
     
     query = User.query
     
     if role:
         query = query.filter_by(role=role)
     
-    users = query.all()
+    if is_streaming_request():
+        rows = query.order_by(*[column.desc() for column in order]).yield_per(1000)
+        return stream_list('users', rows, lambda user: user.to_dict())
     
-    return jsonify({'users': [user.to_dict() for user in users]}), 200
+    limit, cursor, error = parse_page_args(*order)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    users, next_cursor = paginate(query, limit, cursor, *order)
+    
+    return jsonify({
+        'users': [user.to_dict() for user in users],
+        'next_cursor': next_cursor
+    }), 200
 
 @admin_bp.route('/users/<int:user_id>', methods=['PUT'])
 @jwt_required()
@@ -140,6 +186,7 @@ def update_user(user_id):
         user.verified = bool(data['verified'])
     
     try:
+        mark_user_changed(user.id)
         db.session.commit()
         return jsonify({
             'message': 'User updated successfully',
@@ -155,19 +202,25 @@ def update_user(user_id):
 def get_all_bookings():
     """Get all bookings for oversight"""
     status = request.args.get('status')
+    order = (Booking.created_at, Booking.id)
     
-    query = Booking.query
+    query = Booking.query.options(
+        joinedload(Booking.location),
+        joinedload(Booking.traveler)
+    )
     
     if status:
         query = query.filter_by(status=status)
     
-    bookings = query.order_by(Booking.created_at.desc()).limit(100).all()
+    if is_streaming_request():
+        rows = query.order_by(*[column.desc() for column in order]).yield_per(1000)
+        return stream_list('bookings', rows, _booking_with_details)
+    
+    limit, cursor, error = parse_page_args(*order)
+    if error:
+        return jsonify({'error': error}), 400
     
-    bookings_data = []
-    for booking in bookings:
-        booking_dict = booking.to_dict()
-        booking_dict['location'] = booking.location.to_dict()
-        booking_dict['traveler'] = booking.traveler.to_dict()
-        bookings_data.append(booking_dict)
+    bookings, next_cursor = paginate(query, limit, cursor, *order)
+    bookings_data = [_booking_with_details(booking) for booking in bookings]
     
-    return jsonify({'bookings': bookings_data}), 200
+    return jsonify({'bookings': bookings_data, 'next_cursor': next_cursor}), 200
@@ -0,0 +1,32 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from utils.auth_helpers import role_required, get_current_user
+from utils.analytics import parse_day_range, get_analytics
+
+analytics_bp = Blueprint('analytics', __name__, url_prefix='/api/analytics')
+
+@analytics_bp.route('/provider', methods=['GET'])
+@jwt_required()
+@role_required('provider')
+def get_provider_analytics():
+    """Get daily revenue, bookings, bags and cancellations for the provider's locations"""
+    current_user = get_current_user()
+    start, end, error = parse_day_range(request.args)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    location_id = request.args.get('location_id', type=int)
+    return jsonify({'analytics': get_analytics(start, end, current_user.id, location_id)}), 200
+
+@analytics_bp.route('/admin', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_admin_analytics():
+    """Get daily revenue, bookings, bags and cancellations across the platform"""
+    start, end, error = parse_day_range(request.args)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    provider_id = request.args.get('provider_id', type=int)
+    location_id = request.args.get('location_id', type=int)
+    return jsonify({'analytics': get_analytics(start, end, provider_id, location_id)}), 200
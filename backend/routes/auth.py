@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from models import db, User
 from utils.validators import validate_email_address, validate_password
+from utils.auth_helpers import token_claims, get_current_user
+from utils.replicas import use_primary
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
@@ -48,7 +50,7 @@ def register():
         db.session.commit()
         
         # Create tokens
-        access_token = create_access_token(identity=str(user.id))
+        access_token = create_access_token(identity=str(user.id), additional_claims=token_claims(user))
         refresh_token = create_refresh_token(identity=str(user.id))
         
         return jsonify({
@@ -74,8 +76,13 @@ def login():
     if not user or not user.check_password(data['password']):
         return jsonify({'error': 'Invalid email or password'}), 401
     
+    # Upgrade the hash transparently when BCRYPT_ROUNDS changes
+    if user.password_needs_rehash():
+        user.set_password(data['password'])
+        db.session.commit()
+    
     # Create tokens
-    access_token = create_access_token(identity=str(user.id))
+    access_token = create_access_token(identity=str(user.id), additional_claims=token_claims(user))
     refresh_token = create_refresh_token(identity=str(user.id))
     
     return jsonify({
@@ -90,15 +97,21 @@ def login():
 def refresh():
     """Refresh access token"""
     current_user_id = get_jwt_identity()
-    access_token = create_access_token(identity=current_user_id)
+    
+    # Load the user so the new token carries their current role
+    user = User.query.get(int(current_user_id))
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    access_token = create_access_token(identity=current_user_id, additional_claims=token_claims(user))
     return jsonify({'access_token': access_token}), 200
 
 @auth_bp.route('/me', methods=['GET'])
+@use_primary  # Loaded right after signup and login, before a replica may have the user
 @jwt_required()
 def get_current_user_info():
     """Get current user information"""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(int(current_user_id))
+    user = get_current_user()
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -1,9 +1,16 @@
-from flask import Blueprint, request, jsonify
+from datetime import datetime, timedelta
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required
-from datetime import datetime
+from sqlalchemy import case
+from sqlalchemy.orm import joinedload
 from models import db, Booking, StorageLocation
 from utils.auth_helpers import role_required, get_current_user
-from utils.helpers import calculate_price
+from utils.helpers import calculate_price, parse_datetime
+from utils.availability import reserve, apply_status_change
+from utils.analytics import record_booking, record_status_change
+from utils.pagination import parse_page_args, paginate
+from utils.bulk import read_bulk_items
+from utils.idempotency import idempotent
 
 bookings_bp = Blueprint('bookings', __name__, url_prefix='/api/bookings')
 
@@ -15,13 +22,17 @@ def get_bookings():
     
     # Get query parameters
     status = request.args.get('status')
+    order = (Booking.created_at, Booking.id)
+    limit, cursor, error = parse_page_args(*order)
+    if error:
+        return jsonify({'error': error}), 400
     
-    query = Booking.query.filter_by(traveler_id=current_user.id)
+    query = Booking.query.options(joinedload(Booking.location)).filter_by(traveler_id=current_user.id)
     
     if status:
         query = query.filter_by(status=status)
     
-    bookings = query.order_by(Booking.created_at.desc()).all()
+    bookings, next_cursor = paginate(query, limit, cursor, *order)
     
     # Include location details
     bookings_data = []
@@ -30,11 +41,12 @@ def get_bookings():
         booking_dict['location'] = booking.location.to_dict() if booking.location else None
         bookings_data.append(booking_dict)
     
-    return jsonify({'bookings': bookings_data}), 200
+    return jsonify({'bookings': bookings_data, 'next_cursor': next_cursor}), 200
 
 @bookings_bp.route('', methods=['POST'])
 @jwt_required()
 @role_required('traveler')
+@idempotent
 def create_booking():
     """Create a new booking"""
     data = request.get_json()
@@ -56,14 +68,31 @@ def create_booking():
     
     # Parse dates
     try:
-        check_in = datetime.fromisoformat(data['check_in'].replace('Z', '+00:00'))
-        check_out = datetime.fromisoformat(data['check_out'].replace('Z', '+00:00'))
+        check_in = parse_datetime(data['check_in'])
+        check_out = parse_datetime(data['check_out'])
     except ValueError:
         return jsonify({'error': 'Invalid date format'}), 400
     
     if check_out <= check_in:
         return jsonify({'error': 'Check-out must be after check-in'}), 400
     
+    # Bounded so reserve() writes a bounded number of occupancy buckets
+    max_days = current_app.config['BOOKING_MAX_DAYS']
+    if check_out - check_in > timedelta(days=max_days):
+        return jsonify({'error': f'Bookings can last at most {max_days} days'}), 400
+    
+    max_advance_days = current_app.config['BOOKING_MAX_ADVANCE_DAYS']
+    if check_in > datetime.utcnow() + timedelta(days=max_advance_days):
+        return jsonify({'error': f'Check-in must be within {max_advance_days} days'}), 400
+    
+    try:
+        num_bags = int(data['num_bags'])
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid number of bags'}), 400
+    
+    if num_bags < 1:
+        return jsonify({'error': 'Number of bags must be at least 1'}), 400
+    
     # Calculate price
     total_price = calculate_price(check_in, check_out, location.price_per_hour)
     
@@ -73,14 +102,22 @@ def create_booking():
         location_id=location.id,
         check_in=check_in,
         check_out=check_out,
-        num_bags=int(data['num_bags']),
+        num_bags=num_bags,
         total_price=total_price,
         special_instructions=data.get('special_instructions'),
         status='confirmed'
     )
     
     try:
+        # Hold the bag slots; the bucket updates are conditional, so concurrent bookings can't oversell
+        error = reserve(location, check_in, check_out, num_bags)
+        if error:
+            db.session.rollback()
+            return jsonify({'error': error}), 409
+        
         db.session.add(booking)
+        db.session.flush()
+        record_booking(booking)
         db.session.commit()
         
         booking_dict = booking.to_dict()
@@ -99,7 +136,10 @@ def create_booking():
 def get_booking(booking_id):
     """Get a specific booking"""
     current_user = get_current_user()
-    booking = Booking.query.get(booking_id)
+    booking = Booking.query.options(
+        joinedload(Booking.location),
+        joinedload(Booking.traveler)
+    ).get(booking_id)
     
     if not booking:
         return jsonify({'error': 'Booking not found'}), 404
@@ -117,30 +157,155 @@ def get_booking(booking_id):
 @bookings_bp.route('/<int:booking_id>', methods=['PUT'])
 @jwt_required()
 def update_booking(booking_id):
-    """Update booking status"""
+    """Update booking status
+    
+    Follows Booking.TRANSITIONS; travelers can only cancel. The change is a
+    conditional UPDATE, so a concurrent change to the same booking makes
+    this request fail with 409 instead of being overwritten.
+    """
     current_user = get_current_user()
-    booking = Booking.query.get(booking_id)
+    booking = Booking.query.options(joinedload(Booking.location)).filter_by(id=booking_id).first()
     
     if not booking:
         return jsonify({'error': 'Booking not found'}), 404
     
     data = request.get_json()
+    old_status = booking.status
+    new_status = data.get('status') if data else None
     
-    # Travelers can cancel, providers can update status
     if booking.traveler_id == current_user.id:
-        if 'status' in data and data['status'] == 'cancelled':
-            booking.status = 'cancelled'
-    elif booking.location.provider_id == current_user.id:
-        if 'status' in data:
-            booking.status = data['status']
-    else:
+        if new_status != 'cancelled':
+            return jsonify({'error': 'Travelers can only cancel bookings'}), 403
+    elif booking.location.provider_id != current_user.id:
         return jsonify({'error': 'Unauthorized'}), 403
     
+    if new_status == old_status:
+        return jsonify({
+            'message': 'Booking updated successfully',
+            'booking': booking.to_dict()
+        }), 200
+    
+    error = Booking.transition_error(old_status, new_status)
+    if error:
+        return jsonify({'error': error}), 400
+    
     try:
+        if not booking.transition_to(new_status):
+            db.session.rollback()
+            return jsonify({'error': 'Booking was changed by another request, please retry'}), 409
+        
+        error = apply_status_change(booking, old_status, new_status)
+        if error:
+            db.session.rollback()
+            return jsonify({'error': error}), 409
+        
+        record_status_change(booking, old_status, new_status)
+        
+        # Serialize before commit expires the booking, saving a reload
+        booking_dict = booking.to_dict()
         db.session.commit()
         return jsonify({
             'message': 'Booking updated successfully',
-            'booking': booking.to_dict()
+            'booking': booking_dict
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bookings_bp.route('/bulk', methods=['PATCH'])
+@jwt_required()
+def update_bookings_bulk():
+    """Update the status of many bookings at once
+    
+    Takes [{"id": ..., "status": ...}, ...] (or {"bookings": [...]}, or CSV
+    with id,status columns). Permissions and allowed transitions match PUT
+    /api/bookings/<id>. Every item is checked first; if any fails nothing is
+    changed. Statuses are written with one conditional multi-row UPDATE that
+    fails with 409 if any booking changed status meanwhile.
+    """
+    items, error = read_bulk_items('bookings')
+    if error:
+        return jsonify({'error': error}), 400
+    
+    current_user = get_current_user()
+    
+    try:
+        ids = [int(item.get('id')) for item in items]
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Every item needs an integer id'}), 400
+    
+    bookings = {
+        booking.id: booking
+        for booking in Booking.query.options(joinedload(Booking.location)).filter(Booking.id.in_(ids))
+    }
+    
+    errors = []
+    changes = []
+    seen = set()
+    for index, (booking_id, item) in enumerate(zip(ids, items)):
+        booking = bookings.get(booking_id)
+        status = item.get('status')
+        
+        if booking_id in seen:
+            error = 'Duplicate booking id'
+        elif booking is None:
+            error = 'Booking not found'
+        elif booking.traveler_id == current_user.id and status != 'cancelled':
+            error = 'Travelers can only cancel bookings'
+        elif booking.traveler_id != current_user.id and booking.location.provider_id != current_user.id:
+            error = 'Unauthorized'
+        elif status == booking.status:
+            error = None
+        else:
+            error = Booking.transition_error(booking.status, status)
+        
+        seen.add(booking_id)
+        if error:
+            errors.append({'index': index, 'id': booking_id, 'error': error})
+        elif status != booking.status:
+            changes.append((index, booking, status))
+    
+    if errors:
+        return jsonify({'error': 'No bookings were updated, some items are invalid', 'errors': errors}), 400
+    
+    try:
+        if changes:
+            result = db.session.execute(
+                db.update(Booking)
+                .where(
+                    Booking.id.in_([booking.id for _, booking, _ in changes]),
+                    # Only rows still in the status they were validated against
+                    Booking.status == case({booking.id: booking.status for _, booking, _ in changes},
+                                           value=Booking.id)
+                )
+                .values(
+                    status=case({booking.id: status for _, booking, status in changes}, value=Booking.id),
+                    updated_at=datetime.utcnow()
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != len(changes):
+                db.session.rollback()
+                return jsonify({'error': 'No bookings were updated, some were changed by another request, '
+                                         'please retry'}), 409
+        
+        for index, booking, status in changes:
+            error = apply_status_change(booking, booking.status, status)
+            if error:
+                db.session.rollback()
+                return jsonify({
+                    'error': 'No bookings were updated',
+                    'errors': [{'index': index, 'id': booking.id, 'error': error}]
+                }), 409
+            record_status_change(booking, booking.status, status)
+        db.session.commit()
+        
+        return jsonify({
+            'message': f'{len(changes)} bookings updated successfully',
+            'results': [
+                {'index': index, 'id': booking_id, 'status': item['status']}
+                for index, (booking_id, item) in enumerate(zip(ids, items))
+            ]
         }), 200
     except Exception as e:
         db.session.rollback()
@@ -152,13 +317,21 @@ def update_booking(booking_id):
 def get_provider_bookings():
     """Get bookings for provider's locations"""
     current_user = get_current_user()
+    order = (Booking.check_in, Booking.id)
+    limit, cursor, error = parse_page_args(*order)
+    if error:
+        return jsonify({'error': error}), 400
     
     # Get all locations owned by provider
     locations = StorageLocation.query.filter_by(provider_id=current_user.id).all()
     location_ids = [loc.id for loc in locations]
     
     # Get bookings for these locations
-    bookings = Booking.query.filter(Booking.location_id.in_(location_ids)).order_by(Booking.check_in.desc()).all()
+    query = Booking.query.options(
+        joinedload(Booking.location),
+        joinedload(Booking.traveler)
+    ).filter(Booking.location_id.in_(location_ids))
+    bookings, next_cursor = paginate(query, limit, cursor, *order)
     
     bookings_data = []
     for booking in bookings:
@@ -167,4 +340,4 @@ def get_provider_bookings():
         booking_dict['traveler'] = booking.traveler.to_dict()
         bookings_data.append(booking_dict)
     
-    return jsonify({'bookings': bookings_data}), 200
+    return jsonify({'bookings': bookings_data, 'next_cursor': next_cursor}), 200
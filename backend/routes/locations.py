@@ -3,12 +3,61 @@ from flask_jwt_extended import jwt_required
 from models import db, StorageLocation
 from utils.auth_helpers import role_required, get_current_user
 from utils.validators import validate_coordinates
-from utils.helpers import calculate_distance
-import json
+from utils.helpers import calculate_distances, bounding_box, parse_datetime
+from utils.availability import get_availability, get_peak_occupancy, MAX_AVAILABILITY_WINDOW
+from utils.pagination import parse_page_args, paginate
+from utils.cache import cached_response, invalidate_location, invalidate_tags
+from utils.bulk import read_bulk_items
+from utils.streaming import is_streaming_request, stream_list
 
 locations_bp = Blueprint('locations', __name__, url_prefix='/api/locations')
 
+def _locations_within_radius(query, lat, lng, radius, window=None):
+    """Get location dicts within radius km of a point, sorted by distance
+    
+    If window is a (check_in, check_out, num_bags) tuple, only locations with
+    that many free bag slots for the whole window are returned.
+    """
+    # Prefilter on the indexed lat/lng columns so only nearby candidates are loaded
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius)
+    candidates = StorageLocation.projected(query.filter(
+        StorageLocation.latitude.between(min_lat, max_lat),
+        StorageLocation.longitude.between(min_lng, max_lng)
+    )).all()
+    
+    # Score all candidates in one batched call
+    distances, within_radius = calculate_distances(
+        lat, lng,
+        [loc.latitude for loc in candidates],
+        [loc.longitude for loc in candidates],
+        radius
+    )
+    
+    nearby = [(loc, distance) for loc, distance, inside in zip(candidates, distances, within_radius) if inside]
+    
+    if window:
+        # Check free capacity for every nearby location with a single grouped query
+        check_in, check_out, num_bags = window
+        peaks = get_peak_occupancy([loc.id for loc, _ in nearby], check_in, check_out)
+        nearby = [
+            (loc, distance) for loc, distance in nearby
+            if loc.capacity - peaks.get(loc.id, 0) >= num_bags
+        ]
+    
+    locations_with_distance = []
+    for loc, distance in nearby:
+        loc_dict = StorageLocation.row_to_dict(loc)
+        loc_dict['distance'] = distance
+        if window:
+            loc_dict['available_slots'] = loc.capacity - peaks.get(loc.id, 0)
+        locations_with_distance.append(loc_dict)
+    
+    # Sort by distance
+    locations_with_distance.sort(key=lambda x: x['distance'])
+    return locations_with_distance
+
 @locations_bp.route('', methods=['GET'])
+@cached_response(tags=lambda: ['locations'], unless=is_streaming_request)
 def get_locations():
     """Get all storage locations with optional filters"""
     # Get query parameters
@@ -23,60 +72,107 @@ def get_locations():
     if verified_only:
         query = query.filter_by(verified=True)
     
-    locations = query.all()
-    
     # Filter by distance if coordinates provided
-    if lat and lng:
-        locations_with_distance = []
-        for loc in locations:
-            distance = calculate_distance(lat, lng, loc.latitude, loc.longitude)
-            if distance <= radius:
-                loc_dict = loc.to_dict()
-                loc_dict['distance'] = distance
-                locations_with_distance.append(loc_dict)
-        
-        # Sort by distance
-        locations_with_distance.sort(key=lambda x: x['distance'])
-        return jsonify({'locations': locations_with_distance}), 200
+    if lat is not None and lng is not None:
+        return jsonify({'locations': _locations_within_radius(query, lat, lng, radius)}), 200
+    
+    order = (StorageLocation.created_at, StorageLocation.id)
+    
+    # Full export, streamed so memory stays flat
+    if is_streaming_request():
+        rows = StorageLocation.projected(query).order_by(*[column.desc() for column in order])
+        return stream_list('locations', rows.yield_per(1000), StorageLocation.row_to_dict)
+    
+    limit, cursor, error = parse_page_args(*order)
+    if error:
+        return jsonify({'error': error}), 400
     
-    return jsonify({'locations': [loc.to_dict() for loc in locations]}), 200
+    locations, next_cursor = paginate(StorageLocation.projected(query), limit, cursor, *order)
+    
+    return jsonify({
+        'locations': [StorageLocation.row_to_dict(loc) for loc in locations],
+        'next_cursor': next_cursor
+    }), 200
 
-@locations_bp.route('', methods=['POST'])
+@locations_bp.route('/mine', methods=['GET'])
 @jwt_required()
 @role_required('provider')
-def create_location():
-    """Create a new storage location (providers only)"""
-    data = request.get_json()
+def get_my_locations():
+    """Get the current provider's locations, including inactive and unverified ones"""
     current_user = get_current_user()
+    order = (StorageLocation.created_at, StorageLocation.id)
+    limit, cursor, error = parse_page_args(*order)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    query = StorageLocation.query.filter_by(provider_id=current_user.id)
+    locations, next_cursor = paginate(StorageLocation.projected(query), limit, cursor, *order)
+    
+    return jsonify({
+        'locations': [StorageLocation.row_to_dict(loc) for loc in locations],
+        'next_cursor': next_cursor
+    }), 200
+
+def _location_values(data, provider_id):
+    """Validate new location input and build its column values
     
-    # Validate required fields
+    Returns (values, error). List fields may be given as ';'-separated
+    strings, as they arrive from CSV uploads.
+    """
     required_fields = ['business_name', 'address', 'latitude', 'longitude', 'capacity', 'price_per_hour']
     for field in required_fields:
-        if field not in data:
-            return jsonify({'error': f'Missing required field: {field}'}), 400
+        if data.get(field) in (None, ''):
+            return None, f'Missing required field: {field}'
     
-    # Validate coordinates
     is_valid, error = validate_coordinates(data['latitude'], data['longitude'])
     if not is_valid:
+        return None, error
+    
+    try:
+        capacity = int(data['capacity'])
+        price_per_hour = float(data['price_per_hour'])
+    except (ValueError, TypeError):
+        return None, 'capacity and price_per_hour must be numbers'
+    
+    if capacity < 1 or price_per_hour < 0:
+        return None, 'capacity must be positive and price_per_hour not negative'
+    
+    def as_list(value):
+        if isinstance(value, str):
+            return [part.strip() for part in value.split(';') if part.strip()]
+        return value or []
+    
+    return {
+        'provider_id': provider_id,
+        'business_name': data['business_name'],
+        'address': data['address'],
+        'latitude': float(data['latitude']),
+        'longitude': float(data['longitude']),
+        'capacity': capacity,
+        'price_per_hour': price_per_hour,
+        'amenities': as_list(data.get('amenities')),
+        'photos': as_list(data.get('photos')),
+        'description': data.get('description') or ''
+    }, None
+
+@locations_bp.route('', methods=['POST'])
+@jwt_required()
+@role_required('provider')
+def create_location():
+    """Create a new storage location (providers only)"""
+    data = request.get_json()
+    current_user = get_current_user()
+    
+    values, error = _location_values(data, current_user.id)
+    if error:
         return jsonify({'error': error}), 400
     
-    # Create location
-    location = StorageLocation(
-        provider_id=current_user.id,
-        business_name=data['business_name'],
-        address=data['address'],
-        latitude=float(data['latitude']),
-        longitude=float(data['longitude']),
-        capacity=int(data['capacity']),
-        price_per_hour=float(data['price_per_hour']),
-        amenities=json.dumps(data.get('amenities', [])),
-        photos=json.dumps(data.get('photos', [])),
-        description=data.get('description', '')
-    )
+    location = StorageLocation(**values)
     
     try:
         db.session.add(location)
         db.session.commit()
+        invalidate_location(location.id)
         return jsonify({
             'message': 'Location created successfully',
             'location': location.to_dict()
@@ -85,7 +181,50 @@ def create_location():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@locations_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+@role_required('provider')
+def create_locations_bulk():
+    """Create many storage locations at once from a JSON array or CSV upload (providers only)
+    
+    Every item is validated first; if any is invalid nothing is created.
+    Valid batches are written with one multi-row INSERT.
+    """
+    items, error = read_bulk_items('locations')
+    if error:
+        return jsonify({'error': error}), 400
+    
+    current_user = get_current_user()
+    
+    rows = []
+    errors = []
+    for index, item in enumerate(items):
+        values, error = _location_values(item, current_user.id)
+        if error:
+            errors.append({'index': index, 'error': error})
+        else:
+            rows.append(values)
+    
+    if errors:
+        return jsonify({'error': 'No locations were created, some items are invalid', 'errors': errors}), 400
+    
+    try:
+        ids = db.session.execute(
+            db.insert(StorageLocation).returning(StorageLocation.id, sort_by_parameter_order=True),
+            rows
+        ).scalars().all()
+        db.session.commit()
+        invalidate_tags('locations')
+        return jsonify({
+            'message': f'{len(ids)} locations created successfully',
+            'results': [{'index': index, 'id': location_id} for index, location_id in enumerate(ids)]
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @locations_bp.route('/<int:location_id>', methods=['GET'])
+@cached_response(tags=lambda location_id: [f'location:{location_id}'])
 def get_location(location_id):
     """Get a specific location by ID"""
     location = StorageLocation.query.get(location_id)
@@ -95,6 +234,38 @@ def get_location(location_id):
     
     return jsonify({'location': location.to_dict()}), 200
 
+@locations_bp.route('/<int:location_id>/availability', methods=['GET'])
+def get_location_availability(location_id):
+    """Get hourly booked and free bag slots for a location"""
+    location = StorageLocation.query.get(location_id)
+    
+    if not location:
+        return jsonify({'error': 'Location not found'}), 404
+    
+    if not request.args.get('from') or not request.args.get('to'):
+        return jsonify({'error': 'from and to are required'}), 400
+    
+    try:
+        start = parse_datetime(request.args['from'])
+        end = parse_datetime(request.args['to'])
+    except ValueError:
+        return jsonify({'error': 'Invalid date format'}), 400
+    
+    if end <= start:
+        return jsonify({'error': 'to must be after from'}), 400
+    
+    if end - start > MAX_AVAILABILITY_WINDOW:
+        return jsonify({'error': f'Window cannot exceed {MAX_AVAILABILITY_WINDOW.days} days'}), 400
+    
+    buckets = get_availability(location, start, end)
+    
+    return jsonify({
+        'location_id': location.id,
+        'capacity': location.capacity,
+        'available': min(bucket['available'] for bucket in buckets),
+        'buckets': buckets
+    }), 200
+
 @locations_bp.route('/<int:location_id>', methods=['PUT'])
 @jwt_required()
 @role_required('provider')
@@ -122,9 +293,9 @@ def update_location(location_id):
     if 'price_per_hour' in data:
         location.price_per_hour = float(data['price_per_hour'])
     if 'amenities' in data:
-        location.amenities = json.dumps(data['amenities'])
+        location.amenities = data['amenities']
     if 'photos' in data:
-        location.photos = json.dumps(data['photos'])
+        location.photos = data['photos']
     if 'description' in data:
         location.description = data['description']
     if 'active' in data:
@@ -132,6 +303,7 @@ def update_location(location_id):
     
     try:
         db.session.commit()
+        invalidate_location(location.id)
         return jsonify({
             'message': 'Location updated successfully',
             'location': location.to_dict()
@@ -158,36 +330,50 @@ def delete_location(location_id):
         # Soft delete
         location.active = False
         db.session.commit()
+        invalidate_location(location.id)
         return jsonify({'message': 'Location deleted successfully'}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @locations_bp.route('/nearby', methods=['GET'])
+# Availability depends on bookings, so time-window searches aren't cached
+@cached_response(tags=lambda: ['locations'], unless=lambda: 'check_in' in request.args or 'check_out' in request.args)
 def get_nearby_locations():
     """Get storage locations near a specific coordinate"""
     lat = request.args.get('lat', type=float)
     lng = request.args.get('lng', type=float)
     radius = request.args.get('radius', 5, type=float)  # default 5km
     
-    if not lat or not lng:
+    if lat is None or lng is None:
         return jsonify({'error': 'Latitude and longitude required'}), 400
     
     is_valid, error = validate_coordinates(lat, lng)
     if not is_valid:
         return jsonify({'error': error}), 400
     
-    locations = StorageLocation.query.filter_by(active=True, verified=True).all()
-    
-    nearby_locations = []
-    for loc in locations:
-        distance = calculate_distance(lat, lng, loc.latitude, loc.longitude)
-        if distance <= radius:
-            loc_dict = loc.to_dict()
-            loc_dict['distance'] = distance
-            nearby_locations.append(loc_dict)
+    # Optional time window: only return locations with enough free bag slots
+    window = None
+    if request.args.get('check_in') or request.args.get('check_out'):
+        if not request.args.get('check_in') or not request.args.get('check_out'):
+            return jsonify({'error': 'check_in and check_out must be given together'}), 400
+        
+        try:
+            check_in = parse_datetime(request.args['check_in'])
+            check_out = parse_datetime(request.args['check_out'])
+        except ValueError:
+            return jsonify({'error': 'Invalid date format'}), 400
+        
+        if check_out <= check_in:
+            return jsonify({'error': 'Check-out must be after check-in'}), 400
+        
+        num_bags = request.args.get('num_bags', 1, type=int)
+        if num_bags < 1:
+            return jsonify({'error': 'Number of bags must be at least 1'}), 400
+        
+        window = (check_in, check_out, num_bags)
     
-    # Sort by distance
-    nearby_locations.sort(key=lambda x: x['distance'])
+    query = StorageLocation.query.filter_by(active=True, verified=True)
+    nearby_locations = _locations_within_radius(query, lat, lng, radius, window)
     
     return jsonify({'locations': nearby_locations}), 200
@@ -1,13 +1,17 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
+from sqlalchemy.orm import joinedload
 from models import db, Review, Booking, StorageLocation
 from utils.auth_helpers import get_current_user
 from utils.validators import validate_rating
+from utils.cache import cached_response, invalidate_location
+from utils.idempotency import idempotent
 
 reviews_bp = Blueprint('reviews', __name__, url_prefix='/api/reviews')
 
 @reviews_bp.route('', methods=['POST'])
 @jwt_required()
+@idempotent
 def create_review():
     """Submit a review for a completed booking"""
     data = request.get_json()
@@ -51,14 +55,11 @@ def create_review():
     try:
         db.session.add(review)
         
-        # Update location rating
-        location = StorageLocation.query.get(booking.location_id)
-        all_reviews = Review.query.filter_by(location_id=location.id).all()
-        total_rating = sum(r.rating for r in all_reviews) + review.rating
-        location.rating = total_rating / (len(all_reviews) + 1)
-        location.total_reviews = len(all_reviews) + 1
+        # Kept in the request, not a job: the cache is invalidated below, after the rating is committed
+        StorageLocation.add_review_rating(booking.location_id, review.rating)
         
         db.session.commit()
+        invalidate_location(booking.location_id)
         
         return jsonify({
             'message': 'Review submitted successfully',
@@ -69,13 +70,16 @@ def create_review():
         return jsonify({'error': str(e)}), 500
 
 @reviews_bp.route('/location/<int:location_id>', methods=['GET'])
+@cached_response(tags=lambda location_id: [f'location:{location_id}'])
 def get_location_reviews(location_id):
     """Get all reviews for a location"""
     location = StorageLocation.query.get(location_id)
     if not location:
         return jsonify({'error': 'Location not found'}), 404
     
-    reviews = Review.query.filter_by(location_id=location_id).order_by(Review.created_at.desc()).all()
+    reviews = Review.query.options(joinedload(Review.reviewer)).filter_by(
+        location_id=location_id
+    ).order_by(Review.created_at.desc()).all()
     
     return jsonify({
         'reviews': [review.to_dict() for review in reviews],
@@ -0,0 +1,76 @@
+import os
+import sys
+import tempfile
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# Config reads DATABASE_URL at import time, so point it at a throwaway database first
+_fd, DATABASE_PATH = tempfile.mkstemp(suffix='.db', prefix='vcloak-test-')
+os.close(_fd)
+os.environ['DATABASE_URL'] = f'sqlite:///{DATABASE_PATH}'
+
+from flask_jwt_extended import create_access_token
+from app import create_app
+from commands import init_db
+from models import db, User, StorageLocation
+from utils.auth_helpers import token_claims, _token_versions
+from utils.cache import get_cache
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        init_db()
+    yield app
+    os.remove(DATABASE_PATH)
+
+@pytest.fixture(autouse=True)
+def clean_database(app):
+    """Give every test empty tables and an empty cache"""
+    yield
+    with app.app_context():
+        db.session.remove()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+        get_cache().clear()
+        _token_versions.clear()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def make_user(app):
+    """Create a user and return (user_id, auth headers)"""
+    count = 0
+    
+    def make(role='traveler'):
+        nonlocal count
+        count += 1
+        with app.app_context():
+            user = User(email=f'{role}{count}@example.com', name=f'{role} {count}', role=role,
+                        password_hash='not-a-hash', verified=True)
+            db.session.add(user)
+            db.session.commit()
+            token = create_access_token(identity=str(user.id), additional_claims=token_claims(user))
+            return user.id, {'Authorization': f'Bearer {token}'}
+    return make
+
+@pytest.fixture
+def make_location(app):
+    """Create a verified, active location and return its id"""
+    def make(provider_id, capacity=10, **fields):
+        with app.app_context():
+            fields = {'verified': True, 'active': True, **fields}
+            location = StorageLocation(
+                provider_id=provider_id, business_name='Test Storage', address='1 Test Street',
+                latitude=48.85, longitude=2.35, capacity=capacity, price_per_hour=2.0, **fields
+            )
+            db.session.add(location)
+            db.session.commit()
+            return location.id
+    return make
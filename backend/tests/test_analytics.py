@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+from models import db, Booking, Job, LocationDailyStats
+from utils.analytics import rebuild_daily_stats
+from utils.jobs import claim, run_job, work
+
+def _book(client, headers, location_id):
+    check_in = (datetime.utcnow() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+    response = client.post('/api/bookings', headers=headers, json={
+        'location_id': location_id, 'num_bags': 1,
+        'check_in': check_in.isoformat(), 'check_out': (check_in + timedelta(hours=2)).isoformat()
+    })
+    assert response.status_code == 201
+
+def _total_bookings():
+    return db.session.query(db.func.sum(LocationDailyStats.bookings)).scalar()
+
+def test_rebuild_absorbs_queued_and_running_rollup_jobs(app, client, make_user, make_location):
+    provider_id, _ = make_user('provider')
+    location_id = make_location(provider_id)
+    _, traveler = make_user('traveler')
+    _book(client, traveler, location_id)
+    _book(client, traveler, location_id)
+    
+    with app.app_context():
+        # One job is mid-run when the rebuild happens, the other still queued
+        running = claim('worker-1', limit=1)
+        rebuild_daily_stats()
+        db.session.commit()
+        assert _total_bookings() == 2
+        
+        run_job(running[0], 'worker-1')
+        assert work(burst=True) == (0, 0)
+        assert _total_bookings() == 2
+        assert {status for status, in db.session.query(Job.status)} == {'done'}
+
+def test_status_changes_that_keep_the_counts_queue_nothing(app, client, make_user, make_location):
+    provider_id, provider = make_user('provider')
+    location_id = make_location(provider_id)
+    _, traveler = make_user('traveler')
+    _book(client, traveler, location_id)
+    
+    with app.app_context():
+        booking_id = db.session.query(Booking.id).scalar()
+        queued = Job.query.count()
+    for status in ('confirmed', 'active'):
+        response = client.patch('/api/bookings/bulk', headers=provider, json=[{'id': booking_id, 'status': status}])
+        assert response.status_code == 200
+    
+    with app.app_context():
+        assert Job.query.count() == queued
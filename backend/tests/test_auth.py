@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+from models import db, User
+from utils.auth_helpers import mark_user_changed
+from utils.query_counter import count_queries
+
+def test_role_change_applies_to_tokens_already_issued(app, client, make_user):
+    admin_id, admin = make_user('admin')
+    assert client.get('/api/admin/stats', headers=admin).status_code == 200
+    
+    with app.app_context():
+        db.session.get(User, admin_id).role = 'traveler'
+        mark_user_changed(admin_id)
+        db.session.commit()
+    
+    assert client.get('/api/admin/stats', headers=admin).status_code == 403
+
+def test_deleted_user_token_is_rejected(app, client, make_user):
+    admin_id, admin = make_user('admin')
+    with app.app_context():
+        db.session.delete(db.session.get(User, admin_id))
+        db.session.commit()
+    
+    assert client.get('/api/admin/stats', headers=admin).status_code == 404
+
+def test_role_check_needs_no_query_once_the_token_version_is_cached(app, client, make_user):
+    _, admin = make_user('admin')
+    client.get('/api/admin/users', headers=admin)
+    
+    with app.app_context(), count_queries() as counter:
+        assert client.get('/api/admin/users', headers=admin).status_code == 200
+    assert counter.count == 1  # Just the users page
+
+def test_idempotent_retry_is_a_single_lookup(app, client, make_user, make_location):
+    provider_id, _ = make_user('provider')
+    location_id = make_location(provider_id)
+    _, traveler = make_user('traveler')
+    check_in = (datetime.utcnow() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+    body = {'location_id': location_id, 'num_bags': 1, 'check_in': check_in.isoformat(),
+            'check_out': (check_in + timedelta(hours=1)).isoformat()}
+    headers = {**traveler, 'Idempotency-Key': 'retry-once'}
+    assert client.post('/api/bookings', headers=headers, json=body).status_code == 201
+    
+    with app.app_context(), count_queries() as counter:
+        response = client.post('/api/bookings', headers=headers, json=body)
+    assert response.headers['Idempotent-Replayed'] == 'true'
+    assert counter.count == 1
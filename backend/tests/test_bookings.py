@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from models import db, LocationOccupancy
+
+def _window(hours=2, days_ahead=1):
+    check_in = (datetime.utcnow() + timedelta(days=days_ahead)).replace(minute=0, second=0, microsecond=0)
+    return check_in.isoformat(), (check_in + timedelta(hours=hours)).isoformat()
+
+def test_concurrent_bookings_do_not_oversell(app, make_user, make_location):
+    provider_id, _ = make_user('provider')
+    location_id = make_location(provider_id, capacity=3)
+    _, traveler = make_user('traveler')
+    check_in, check_out = _window()
+    
+    def book(_):
+        response = app.test_client().post('/api/bookings', headers=traveler, json={
+            'location_id': location_id, 'check_in': check_in, 'check_out': check_out, 'num_bags': 1
+        })
+        return response.status_code
+    
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        statuses = list(pool.map(book, range(12)))
+    
+    assert sorted(statuses) == [201] * 3 + [409] * 9
+    with app.app_context():
+        assert db.session.query(func.max(LocationOccupancy.bags)).scalar() == 3
+
+def test_booking_over_capacity_leaves_occupancy_unchanged(app, client, make_user, make_location):
+    provider_id, _ = make_user('provider')
+    location_id = make_location(provider_id, capacity=2)
+    _, traveler = make_user('traveler')
+    
+    first_in, first_out = _window(hours=1)
+    response = client.post('/api/bookings', headers=traveler, json={
+        'location_id': location_id, 'check_in': first_in, 'check_out': first_out, 'num_bags': 2
+    })
+    assert response.status_code == 201
+    
+    # Overlaps the full hour and one free hour; neither bucket may change
+    check_in, check_out = _window(hours=2)
+    response = client.post('/api/bookings', headers=traveler, json={
+        'location_id': location_id, 'check_in': check_in, 'check_out': check_out, 'num_bags': 1
+    })
+    assert response.status_code == 409
+    with app.app_context():
+        assert [bags for _, bags in db.session.query(LocationOccupancy.bucket_start, LocationOccupancy.bags)
+                .order_by(LocationOccupancy.bucket_start)] == [2]
+
+def test_booking_length_and_advance_are_limited(app, client, make_user, make_location):
+    provider_id, _ = make_user('provider')
+    location_id = make_location(provider_id)
+    _, traveler = make_user('traveler')
+    
+    too_long = _window(hours=24 * app.config['BOOKING_MAX_DAYS'] + 1)
+    too_far = _window(days_ahead=app.config['BOOKING_MAX_ADVANCE_DAYS'] + 1)
+    for check_in, check_out in (too_long, too_far):
+        response = client.post('/api/bookings', headers=traveler, json={
+            'location_id': location_id, 'check_in': check_in, 'check_out': check_out, 'num_bags': 1
+        })
+        assert response.status_code == 400
+    with app.app_context():
+        assert LocationOccupancy.query.count() == 0
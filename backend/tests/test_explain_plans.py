@@ -0,0 +1,10 @@
+from benchmarks.explain_queries import seed_endpoints, check_plans
+
+def test_read_endpoints_use_indexes(app):
+    endpoints = seed_endpoints(app, providers=20, travelers=200, locations=300, bookings=3000, reviews=500)
+    
+    results = list(check_plans(app, endpoints))
+    assert len(results) > len(endpoints)  # Second pages were checked too
+    for url, status, scans in results:
+        assert status == 200, url
+        assert not scans, f'{url} reads {", ".join(sorted(scans))} in full'
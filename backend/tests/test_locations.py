@@ -0,0 +1,21 @@
+def test_my_locations_lists_only_the_providers_own_across_pages(client, make_user, make_location):
+    provider_id, provider = make_user('provider')
+    other_id, _ = make_user('provider')
+    own = {make_location(provider_id), make_location(provider_id), make_location(provider_id, active=False)}
+    make_location(other_id)
+    
+    seen, cursor = [], None
+    while True:
+        params = {'limit': 2, **({'cursor': cursor} if cursor else {})}
+        response = client.get('/api/locations/mine', headers=provider, query_string=params)
+        assert response.status_code == 200
+        seen += [location['id'] for location in response.get_json()['locations']]
+        cursor = response.get_json()['next_cursor']
+        if not cursor:
+            break
+    
+    assert sorted(seen) == sorted(own)
+
+def test_my_locations_requires_provider(client, make_user):
+    _, traveler = make_user('traveler')
+    assert client.get('/api/locations/mine', headers=traveler).status_code == 403
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+import pytest
+from models import db, Booking, Review
+from utils.cache import get_cache
+from utils.query_counter import assert_max_queries, count_queries
+
+ROWS = 5  # Enough rows that a lazy load per row would blow every budget below
+
+@pytest.fixture
+def seeded(app, make_user, make_location):
+    """Providers with locations, and travelers with completed, reviewed bookings at each"""
+    admin = make_user('admin')[1]
+    providers = [make_user('provider') for _ in range(ROWS)]
+    travelers = [make_user('traveler') for _ in range(ROWS)]
+    locations = [make_location(provider_id) for provider_id, _ in providers]
+    
+    with app.app_context():
+        check_in = datetime.utcnow() - timedelta(days=3)
+        for traveler_id, _ in travelers:
+            for location_id in locations:
+                booking = Booking(traveler_id=traveler_id, location_id=location_id, check_in=check_in,
+                                  check_out=check_in + timedelta(hours=2), num_bags=1, total_price=4.0,
+                                  status='completed')
+                db.session.add(booking)
+                db.session.flush()
+                db.session.add(Review(booking_id=booking.id, traveler_id=traveler_id,
+                                      location_id=location_id, rating=5, comment='Fine'))
+        db.session.commit()
+    
+    return {'admin': admin, 'provider': providers[0][1], 'traveler': travelers[0][1], 'location_id': locations[0]}
+
+@pytest.mark.parametrize('path, role, max_queries', [
+    ('/api/bookings', 'traveler', 2),  # The view loads the current user
+    ('/api/bookings/provider', 'provider', 3),
+    ('/api/admin/bookings', 'admin', 1),
+    ('/api/admin/providers', 'admin', 2),  # Plus the selectinload of their locations
+    ('/api/admin/users', 'admin', 1),
+    ('/api/reviews/location/{location_id}', None, 2),
+])
+def test_listing_query_count_does_not_grow_with_rows(app, client, seeded, path, role, max_queries):
+    headers = seeded[role] if role else {}
+    path = path.format(**seeded)
+    # Warm the token version cache, leaving role checks query-free as in steady state
+    client.get(path, headers=headers)
+    with app.app_context():
+        get_cache().clear()
+    
+    with app.app_context(), assert_max_queries(max_queries):
+        response = client.get(path, headers=headers)
+    assert response.status_code == 200
+
+def test_get_booking_loads_relations_eagerly(app, client, seeded):
+    with app.app_context():
+        booking_id = db.session.query(Booking.id).order_by(Booking.id).limit(1).scalar()
+    with app.app_context(), count_queries() as counter:
+        response = client.get(f'/api/bookings/{booking_id}', headers=seeded['traveler'])
+    assert response.status_code == 200
+    assert counter.count <= 2
@@ -0,0 +1,17 @@
+import pytest
+from flask import Flask
+from utils.replicas import init_replicas
+
+def _app(debug, cache_backend):
+    app = Flask(__name__)
+    app.debug = debug
+    app.config.update(DATABASE_REPLICA_URLS=['sqlite:///replica.db'], CACHE_BACKEND=cache_backend)
+    return app
+
+def test_replicas_require_a_shared_cache_in_production():
+    with pytest.raises(RuntimeError, match='CACHE_BACKEND=redis'):
+        init_replicas(_app(debug=False, cache_backend='memory'))
+
+def test_replicas_allow_a_shared_cache_or_local_debugging():
+    init_replicas(_app(debug=False, cache_backend='redis'))
+    init_replicas(_app(debug=True, cache_backend='memory'))
@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta
+from models import db, Booking
+
+def test_review_rating_is_visible_immediately(app, client, make_user, make_location):
+    provider_id, _ = make_user('provider')
+    location_id = make_location(provider_id)
+    traveler_id, traveler = make_user('traveler')
+    with app.app_context():
+        check_in = datetime.utcnow() - timedelta(days=2)
+        booking = Booking(traveler_id=traveler_id, location_id=location_id, check_in=check_in,
+                          check_out=check_in + timedelta(hours=3), num_bags=1, total_price=6.0,
+                          status='completed')
+        db.session.add(booking)
+        db.session.commit()
+        booking_id = booking.id
+    
+    # Warm the response cache with the unrated location
+    assert client.get(f'/api/locations/{location_id}').get_json()['location']['total_reviews'] == 0
+    
+    response = client.post('/api/reviews', headers=traveler, json={'booking_id': booking_id, 'rating': 4})
+    assert response.status_code == 201
+    
+    location = client.get(f'/api/locations/{location_id}').get_json()['location']
+    assert (location['rating'], location['total_reviews']) == (4.0, 1)
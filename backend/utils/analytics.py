@@ -0,0 +1,189 @@
+from datetime import date, timedelta
+from sqlalchemy import case, func, text
+from models import db, Booking, Job, LocationDailyStats, StorageLocation
+from utils.helpers import dialect_insert
+from utils.jobs import job, enqueue
+
+MAX_ANALYTICS_WINDOW = timedelta(days=366)
+DEFAULT_ANALYTICS_WINDOW = timedelta(days=30)
+
+def _contribution(booking, status):
+    """Get what a booking in a status adds to its day: (bookings, cancelled, bags, revenue)"""
+    if status == 'cancelled':
+        return 1, 1, 0, 0.0
+    return 1, 0, booking.num_bags, booking.total_price or 0.0
+
+def _add_to_day(location_id, day, bookings, cancelled, bags, revenue):
+    """Add deltas to one daily rollup row, creating it if needed, in one atomic upsert"""
+    stmt = dialect_insert(LocationDailyStats).values(
+        location_id=location_id, day=day, bookings=bookings, cancelled=cancelled, bags=bags, revenue=revenue
+    )
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=['location_id', 'day'],
+        set_={
+            'bookings': LocationDailyStats.bookings + stmt.excluded.bookings,
+            'cancelled': LocationDailyStats.cancelled + stmt.excluded.cancelled,
+            'bags': LocationDailyStats.bags + stmt.excluded.bags,
+            'revenue': LocationDailyStats.revenue + stmt.excluded.revenue
+        }
+    ))
+
+@job('analytics.booking_created')
+def _apply_booking_created(booking_id, status):
+    booking = db.session.get(Booking, booking_id)
+    _add_to_day(booking.location_id, booking.check_in.date(), *_contribution(booking, status))
+
+@job('analytics.status_changed')
+def _apply_status_change(booking_id, old_status, new_status):
+    booking = db.session.get(Booking, booking_id)
+    old = _contribution(booking, old_status)
+    new = _contribution(booking, new_status)
+    if old != new:
+        _add_to_day(booking.location_id, booking.check_in.date(), *(n - o for n, o in zip(new, old)))
+
+def record_booking(booking):
+    """Queue counting a new booking in the daily rollups"""
+    enqueue('analytics.booking_created', {'booking_id': booking.id, 'status': booking.status},
+            key=f'analytics:booking:{booking.id}:created')
+
+def record_status_change(booking, old_status, new_status):
+    """Queue moving a booking between statuses in the daily rollups
+    
+    Statuses only move forward, so each change of a booking is queued once.
+    Changes that leave the booking's counts as they were (e.g. confirmed to
+    active) queue nothing.
+    """
+    if _contribution(booking, old_status) == _contribution(booking, new_status):
+        return
+    enqueue('analytics.status_changed',
+            {'booking_id': booking.id, 'old_status': old_status, 'new_status': new_status},
+            key=f'analytics:booking:{booking.id}:{old_status}:{new_status}')
+
+def _lock_for_rebuild():
+    """Keep rollup jobs and new bookings from interleaving with a rebuild until it commits
+    
+    On PostgreSQL a job upserts rollups and then finishes its job row, so
+    the tables are locked in that order: in-flight jobs finish first, and
+    requests queueing new jobs wait for the rebuild. SQLite already allows
+    one writer at a time, and the rebuild's first write takes that lock.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(text('LOCK TABLE location_daily_stats IN EXCLUSIVE MODE'))
+        db.session.execute(text('LOCK TABLE jobs IN EXCLUSIVE MODE'))
+
+def rebuild_daily_stats():
+    """Rebuild every daily rollup from the bookings table in one grouped INSERT ... SELECT
+    
+    Queued and running rollup jobs are marked done in the same transaction,
+    since the rebuild already counts their changes; a running job then
+    fails to finish and rolls its update back. Returns the number of rows written.
+    """
+    is_cancelled = Booking.status == 'cancelled'
+    rollup = db.select(
+        Booking.location_id,
+        func.date(Booking.check_in),
+        func.count(Booking.id),
+        func.sum(case((is_cancelled, 1), else_=0)),
+        func.sum(case((is_cancelled, 0), else_=Booking.num_bags)),
+        func.sum(case((is_cancelled, 0.0), else_=func.coalesce(Booking.total_price, 0.0)))
+    ).group_by(Booking.location_id, func.date(Booking.check_in))
+    
+    _lock_for_rebuild()
+    db.session.execute(
+        db.update(Job)
+        .where(
+            Job.name.in_(['analytics.booking_created', 'analytics.status_changed']),
+            Job.status.in_(['pending', 'running'])
+        )
+        .values(status='done', locked_by=None, locked_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.execute(db.delete(LocationDailyStats))
+    result = db.session.execute(db.insert(LocationDailyStats).from_select(
+        ['location_id', 'day', 'bookings', 'cancelled', 'bags', 'revenue'], rollup
+    ))
+    return result.rowcount
+
+def parse_day_range(args):
+    """Parse from/to (YYYY-MM-DD, inclusive) query arguments
+    
+    Defaults to the last 30 days. Returns (start, end, error).
+    """
+    try:
+        end = date.fromisoformat(args['to']) if args.get('to') else date.today()
+        start = date.fromisoformat(args['from']) if args.get('from') else end - DEFAULT_ANALYTICS_WINDOW
+    except ValueError:
+        return None, None, 'Invalid date format, expected YYYY-MM-DD'
+    
+    if end < start:
+        return None, None, '"to" must not be before "from"'
+    if end - start > MAX_ANALYTICS_WINDOW:
+        return None, None, f'Date range cannot exceed {MAX_ANALYTICS_WINDOW.days} days'
+    return start, end, None
+
+def _summary(bookings, cancelled, bags, revenue):
+    bookings = bookings or 0
+    cancelled = cancelled or 0
+    return {
+        'bookings': bookings,
+        'cancelled': cancelled,
+        'bags': bags or 0,
+        'revenue': round(revenue or 0.0, 2),
+        'cancellation_rate': round(cancelled / bookings, 4) if bookings else 0.0
+    }
+
+def get_analytics(start, end, provider_id=None, location_id=None):
+    """Get totals, a zero-filled daily series and a per-location breakdown from the rollups
+    
+    Covers check-in days from start to end inclusive, optionally limited to
+    one provider's locations and/or one location.
+    """
+    totals = (
+        func.sum(LocationDailyStats.bookings),
+        func.sum(LocationDailyStats.cancelled),
+        func.sum(LocationDailyStats.bags),
+        func.sum(LocationDailyStats.revenue)
+    )
+    
+    def scoped(query):
+        query = query.filter(LocationDailyStats.day >= start, LocationDailyStats.day <= end)
+        if provider_id is not None:
+            query = query.join(StorageLocation, StorageLocation.id == LocationDailyStats.location_id).filter(
+                StorageLocation.provider_id == provider_id
+            )
+        if location_id is not None:
+            query = query.filter(LocationDailyStats.location_id == location_id)
+        return query
+    
+    by_day = {
+        day: _summary(*values)
+        for day, *values in scoped(db.session.query(LocationDailyStats.day, *totals))
+        .group_by(LocationDailyStats.day)
+    }
+    
+    empty = _summary(0, 0, 0, 0.0)
+    daily = []
+    day = start
+    while day <= end:
+        daily.append({'day': day, **by_day.get(day, empty)})
+        day += timedelta(days=1)
+    
+    locations = []
+    rows = scoped(
+        db.session.query(LocationDailyStats.location_id, *totals)
+    ).group_by(LocationDailyStats.location_id).all()
+    names = dict(
+        db.session.query(StorageLocation.id, StorageLocation.business_name)
+        .filter(StorageLocation.id.in_([row[0] for row in rows]))
+    ) if rows else {}
+    for loc_id, *values in rows:
+        locations.append({'location_id': loc_id, 'business_name': names.get(loc_id), **_summary(*values)})
+    locations.sort(key=lambda location: location['revenue'], reverse=True)
+    
+    return {
+        'from': start,
+        'to': end,
+        'totals': _summary(*(sum(d[key] for d in daily) for key in ('bookings', 'cancelled', 'bags', 'revenue'))),
+        'daily': daily,
+        'locations': locations
+    }
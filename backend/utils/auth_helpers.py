@@ -1,7 +1,57 @@
 from functools import wraps
-from flask import jsonify
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
-from models import User
+from flask import jsonify, g, current_app
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from models import db, User
+from utils.cache import TTLCache
+
+# User id -> token_version, so role checks from JWT claims usually need no query
+_token_versions = TTLCache(max_entries=10000)
+
+def token_claims(user):
+    """Extra JWT claims so role checks don't need to load the user"""
+    return {'role': user.role, 'tv': user.token_version or 0}
+
+def mark_user_changed(user_id):
+    """Make tokens issued before this change re-check the user against the database
+    
+    Bumps users.token_version in the caller's transaction. Once it commits,
+    this worker sees it on the next request and the others within
+    TOKEN_VERSION_CACHE_TTL seconds, without waiting for tokens to expire.
+    """
+    db.session.execute(
+        db.update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    _token_versions.delete(str(user_id))
+
+def _load_user(user_id):
+    """Load a user at most once per request"""
+    if 'current_user' not in g:
+        g.current_user = User.query.get(int(user_id))
+    return g.current_user
+
+def _token_version(user_id):
+    """Get a user's token_version, or None if the user doesn't exist
+    
+    Read from the request's loaded user if there is one, else from a
+    per-process cache kept for TOKEN_VERSION_CACHE_TTL seconds.
+    """
+    if g.get('current_user') is not None:
+        return g.current_user.token_version
+    
+    version = _token_versions.get(str(user_id))
+    if version is None:
+        version = db.session.query(User.token_version).filter_by(id=int(user_id)).scalar()
+        if version is not None:
+            _token_versions.set(str(user_id), version, ttl=current_app.config['TOKEN_VERSION_CACHE_TTL'])
+    return version
+
+def _claims_outdated(user_id, claims):
+    """Check whether the user changed after the token was issued"""
+    version = _token_version(user_id)
+    return version is None or claims.get('tv') != version
 
 def role_required(*allowed_roles):
     """Decorator to check if user has required role"""
@@ -10,12 +60,19 @@ def role_required(*allowed_roles):
         def wrapper(*args, **kwargs):
             verify_jwt_in_request()
             current_user_id = get_jwt_identity()
-            user = User.query.get(int(current_user_id))
+            claims = get_jwt()
+            role = claims.get('role')
             
-            if not user:
-                return jsonify({'error': 'User not found'}), 404
+            # Fall back to the database for tokens without a role claim or issued before a change
+            if role is None or _claims_outdated(current_user_id, claims):
+                user = _load_user(current_user_id)
+                
+                if not user:
+                    return jsonify({'error': 'User not found'}), 404
+                
+                role = user.role
             
-            if user.role not in allowed_roles:
+            if role not in allowed_roles:
                 return jsonify({'error': 'Insufficient permissions'}), 403
             
             return fn(*args, **kwargs)
@@ -26,4 +83,4 @@ def get_current_user():
     """Get current authenticated user"""
     verify_jwt_in_request()
     current_user_id = get_jwt_identity()
-    return User.query.get(int(current_user_id))
+    return _load_user(current_user_id)
@@ -0,0 +1,173 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy import case, func
+from models import db, StorageLocation, Booking, LocationOccupancy
+from utils.helpers import dialect_insert
+
+BUCKET_SIZE = timedelta(hours=1)
+MAX_AVAILABILITY_WINDOW = timedelta(days=31)
+
+def bucket_start(dt):
+    """Truncate a datetime to the start of its hourly bucket"""
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+def bucket_range(start, end):
+    """Get the bucket starts covering [start, end)"""
+    buckets = []
+    current = bucket_start(start)
+    while current < end:
+        buckets.append(current)
+        current += BUCKET_SIZE
+    return buckets
+
+def get_occupancy(location_id, start, end):
+    """Get {bucket_start: bags} for the stored buckets of a location within [start, end)"""
+    rows = db.session.query(LocationOccupancy.bucket_start, LocationOccupancy.bags).filter(
+        LocationOccupancy.location_id == location_id,
+        LocationOccupancy.bucket_start >= bucket_start(start),
+        LocationOccupancy.bucket_start < end
+    ).all()
+    return dict(rows)
+
+def get_peak_occupancy(location_ids, start, end):
+    """Get {location_id: peak bags} within [start, end) for many locations in one grouped query"""
+    if not location_ids:
+        return {}
+    
+    rows = db.session.query(
+        LocationOccupancy.location_id,
+        func.max(LocationOccupancy.bags)
+    ).filter(
+        LocationOccupancy.location_id.in_(location_ids),
+        LocationOccupancy.bucket_start >= bucket_start(start),
+        LocationOccupancy.bucket_start < end
+    ).group_by(LocationOccupancy.location_id).all()
+    return dict(rows)
+
+def get_availability(location, start, end):
+    """Get booked and free bag slots per bucket of a location within [start, end)"""
+    occupancy = get_occupancy(location.id, start, end)
+    
+    buckets = []
+    for bucket in bucket_range(start, end):
+        booked = occupancy.get(bucket, 0)
+        buckets.append({
+            'start': bucket,
+            'booked': booked,
+            'available': max(location.capacity - booked, 0)
+        })
+    return buckets
+
+def _lock_location(location_id):
+    """Queue reservations for one location behind each other on PostgreSQL
+    
+    Not what prevents overselling (the conditional UPDATE in reserve() is),
+    but it stops two reservations from locking the same buckets in different
+    orders and deadlocking. SQLite ignores FOR UPDATE; there the first
+    bucket write takes the database write lock instead.
+    """
+    db.session.query(StorageLocation.id).filter_by(id=location_id).with_for_update().first()
+
+def reserve(location, check_in, check_out, num_bags):
+    """Hold num_bags slots at a location for [check_in, check_out)
+    
+    The capacity check is part of the bucket UPDATE itself (bags + n <=
+    capacity), so it holds under concurrent bookings on any database. Runs
+    in O(buckets) regardless of how many bookings the location has. Returns
+    an error message if capacity is exceeded, otherwise None; the caller
+    must then roll back, as some buckets may already have been updated.
+    """
+    buckets = bucket_range(check_in, check_out)
+    if not buckets:
+        return None
+    if num_bags > location.capacity:
+        return 'Not enough capacity for the selected time'
+    
+    _lock_location(location.id)
+    
+    # Create missing buckets empty; a bucket a concurrent booking just created is left alone
+    db.session.execute(
+        dialect_insert(LocationOccupancy)
+        .values([{'location_id': location.id, 'bucket_start': bucket, 'bags': 0} for bucket in buckets])
+        .on_conflict_do_nothing(index_elements=['location_id', 'bucket_start'])
+    )
+    result = db.session.execute(
+        db.update(LocationOccupancy)
+        .where(
+            LocationOccupancy.location_id == location.id,
+            LocationOccupancy.bucket_start.in_(buckets),
+            LocationOccupancy.bags + num_bags <= location.capacity
+        )
+        .values(bags=LocationOccupancy.bags + num_bags)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != len(buckets):
+        return 'Not enough capacity for the selected time'
+    return None
+
+def release(booking, start=None):
+    """Free the slots held by a booking from start (default check-in) until check-out"""
+    start = max(booking.check_in, start) if start else booking.check_in
+    buckets = bucket_range(start, booking.check_out)
+    if not buckets:
+        return
+    
+    db.session.execute(
+        db.update(LocationOccupancy)
+        .where(
+            LocationOccupancy.location_id == booking.location_id,
+            LocationOccupancy.bucket_start.in_(buckets)
+        )
+        .values(bags=case(
+            (LocationOccupancy.bags > booking.num_bags, LocationOccupancy.bags - booking.num_bags),
+            else_=0
+        ))
+        .execution_options(synchronize_session=False)
+    )
+
+def apply_status_change(booking, old_status, new_status):
+    """Keep occupancy in step with a booking status change
+    
+    Returns an error message if re-opening the booking would exceed capacity.
+    """
+    was_occupying = old_status in Booking.OCCUPYING_STATUSES
+    is_occupying = new_status in Booking.OCCUPYING_STATUSES
+    
+    if was_occupying and not is_occupying:
+        # Completed bookings stop holding slots from the moment bags are collected
+        release(booking, start=datetime.utcnow() if new_status == 'completed' else None)
+    elif is_occupying and not was_occupying:
+        return reserve(booking.location, booking.check_in, booking.check_out, booking.num_bags)
+    return None
+
+def rebuild_occupancy(location_id=None):
+    """Rebuild future occupancy buckets from the bookings that hold slots
+    
+    Returns the number of buckets written.
+    """
+    now = bucket_start(datetime.utcnow())
+    
+    if location_id is not None:
+        bookings = Booking.overlapping(location_id, now, datetime.max)
+    else:
+        bookings = Booking.query.filter(
+            Booking.check_out > now,
+            Booking.status.in_(Booking.OCCUPYING_STATUSES)
+        )
+    
+    totals = Counter()
+    for booking in bookings.yield_per(1000):
+        for bucket in bucket_range(max(booking.check_in, now), booking.check_out):
+            totals[(booking.location_id, bucket)] += booking.num_bags
+    
+    stale = LocationOccupancy.query.filter(LocationOccupancy.bucket_start >= now)
+    if location_id is not None:
+        stale = stale.filter(LocationOccupancy.location_id == location_id)
+    stale.delete(synchronize_session=False)
+    
+    if totals:
+        db.session.execute(db.insert(LocationOccupancy), [
+            {'location_id': loc_id, 'bucket_start': bucket, 'bags': bags}
+            for (loc_id, bucket), bags in totals.items()
+        ])
+    return len(totals)
@@ -0,0 +1,33 @@
+import csv
+import io
+from flask import current_app, request
+
+def read_bulk_items(key):
+    """Read the items of a bulk request
+    
+    Accepts a JSON array, a JSON object holding the array under key, or CSV
+    (a text/csv body or a multipart upload named "file") with a header row.
+    Returns (items, error).
+    """
+    if request.mimetype == 'text/csv' or 'file' in request.files:
+        if 'file' in request.files:
+            text = io.TextIOWrapper(request.files['file'].stream, encoding='utf-8-sig')
+        else:
+            text = io.StringIO(request.get_data(as_text=True))
+        try:
+            items = list(csv.DictReader(text))
+        except (csv.Error, UnicodeDecodeError):
+            return None, 'Invalid CSV'
+    else:
+        data = request.get_json(silent=True)
+        items = data.get(key) if isinstance(data, dict) else data
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return None, f'Expected a JSON array of objects or {{"{key}": [...]}}'
+    
+    if not items:
+        return None, 'No items given'
+    
+    max_items = current_app.config['BULK_MAX_ITEMS']
+    if len(items) > max_items:
+        return None, f'At most {max_items} items per request'
+    return items, None
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, g, request, Response
+
+class TTLCache:
+    """Thread-safe in-process cache whose entries expire after a TTL in seconds
+    
+    When max_entries is set, the least recently used entry is evicted first.
+    """
+    
+    def __init__(self, ttl=60, max_entries=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Get a cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value, ttl=None):
+        """Cache a value for ttl seconds (defaults to the cache TTL)"""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._data) > self.max_entries:
+                    self._data.popitem(last=False)
+    
+    def delete(self, key):
+        """Remove a cached value"""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self):
+        """Remove every cached value"""
+        with self._lock:
+            self._data.clear()
+
+class RedisCache:
+    """Cache shared between workers, backed by any Redis-compatible client
+    
+    The client only needs get, set (with ex), delete and scan_iter, so a local
+    stand-in such as fakeredis works for tests.
+    """
+    
+    def __init__(self, client, ttl=60, prefix='vcloak:cache:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+    
+    def get(self, key):
+        """Get a cached value, or None if missing or expired"""
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+    
+    def set(self, key, value, ttl=None):
+        """Cache a value for ttl seconds (defaults to the cache TTL)"""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+    
+    def delete(self, key):
+        """Remove a cached value"""
+        self.client.delete(self.prefix + key)
+    
+    def clear(self):
+        """Remove every value under this cache's prefix"""
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            self.client.delete(key)
+
+def init_cache(app):
+    """Create the response cache configured by CACHE_BACKEND"""
+    backend = app.config['CACHE_BACKEND']
+    ttl = app.config['CACHE_DEFAULT_TTL']
+    
+    if backend == 'redis':
+        import redis  # Optional dependency, only needed for the shared backend
+        client = redis.Redis.from_url(app.config['CACHE_REDIS_URL'])
+        cache = RedisCache(client, ttl=ttl)
+    elif backend == 'memory':
+        cache = TTLCache(ttl=ttl, max_entries=app.config['CACHE_MAX_ENTRIES'])
+    elif backend == 'null':
+        cache = TTLCache(ttl=0)
+    else:
+        raise ValueError(f'Unknown CACHE_BACKEND: {backend}')
+    
+    app.extensions['response_cache'] = cache
+    return cache
+
+def get_cache():
+    """Get the response cache of the current app"""
+    return current_app.extensions['response_cache']
+
+def _tag_version(cache, tag):
+    """Get the current version token of an invalidation tag"""
+    version = cache.get(f'tag:{tag}')
+    if version is None:
+        # A missing tag starts a new generation, so evicted tags never resurrect old entries
+        version = uuid.uuid4().hex
+        cache.set(f'tag:{tag}', version, ttl=86400)
+    return version
+
+def invalidate_tags(*tags):
+    """Invalidate every cached response depending on any of the tags"""
+    cache = get_cache()
+    replica_lag = current_app.config['REPLICA_STICKY_SECONDS'] if current_app.config['DATABASE_REPLICA_URLS'] else 0
+    for tag in tags:
+        cache.delete(f'tag:{tag}')
+        if replica_lag:
+            # Replicas may still serve the old data for a while; see cached_response
+            cache.set(f'tag-changed:{tag}', 1, ttl=replica_lag)
+
+def invalidate_location(location_id):
+    """Invalidate cached responses for a location and all location listings"""
+    invalidate_tags(f'location:{location_id}', 'locations')
+
+def cached_response(tags, unless=None):
+    """Cache a public GET view's JSON response, with ETag / If-None-Match support
+    
+    tags is called with the view arguments and returns the invalidation tags
+    the response depends on. Requests for which unless() is true bypass the
+    cache. Only 200 responses are cached.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if unless is not None and unless():
+                return fn(*args, **kwargs)
+            
+            cache = get_cache()
+            view_tags = tags(**kwargs)
+            versions = [_tag_version(cache, tag) for tag in view_tags]
+            key_source = request.full_path + '|' + '|'.join(versions)
+            key = 'response:' + hashlib.sha1(key_source.encode('utf-8')).hexdigest()
+            
+            entry = cache.get(key)
+            if entry is None:
+                response = current_app.make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                # Don't cache what a lagging replica read just after the data changed
+                if g.get('db_replica') is not None and any(
+                    cache.get(f'tag-changed:{tag}') is not None for tag in view_tags
+                ):
+                    return response
+                
+                body = response.get_data(as_text=True)
+                entry = {'body': body, 'etag': hashlib.sha1(body.encode('utf-8')).hexdigest()}
+                cache.set(key, entry)
+            
+            response = Response(entry['body'], mimetype='application/json')
+            response.set_etag(entry['etag'])
+            response.cache_control.no_cache = True  # Clients revalidate with If-None-Match
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
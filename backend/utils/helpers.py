@@ -1,5 +1,30 @@
 import math
-from datetime import datetime
+from datetime import datetime, timezone
+
+_numpy = None
+
+def _get_numpy():
+    """Import NumPy on first use so it stays out of app startup
+    
+    Returns None when NumPy isn't installed; callers fall back to pure Python.
+    """
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+def dialect_insert(model):
+    """Get an INSERT for model that supports ON CONFLICT on both PostgreSQL and SQLite"""
+    from models import db
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
 
 def calculate_distance(lat1, lon1, lat2, lon2):
     """Calculate distance between two coordinates in kilometers using Haversine formula"""
@@ -16,6 +41,54 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     distance = R * c
     return round(distance, 2)
 
+def calculate_distances(lat, lng, latitudes, longitudes, radius=None):
+    """Calculate distances in kilometers from one point to many using Haversine formula
+    
+    Returns a (distances, within_radius) pair of lists. Every point is within
+    radius when no radius is given.
+    """
+    R = 6371  # Earth's radius in kilometers
+    np = _get_numpy()
+    
+    if np is not None:
+        lat1_rad = math.radians(lat)
+        lat2_rad = np.radians(np.asarray(latitudes, dtype=float))
+        delta_lat = lat2_rad - lat1_rad
+        delta_lon = np.radians(np.asarray(longitudes, dtype=float) - lng)
+        
+        a = np.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lon / 2) ** 2
+        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        
+        distances = np.round(R * c, 2)
+        mask = distances <= radius if radius is not None else np.ones(len(distances), dtype=bool)
+        return distances.tolist(), mask.tolist()
+    
+    distances = [calculate_distance(lat, lng, lat2, lng2) for lat2, lng2 in zip(latitudes, longitudes)]
+    mask = [radius is None or distance <= radius for distance in distances]
+    return distances, mask
+
+def bounding_box(lat, lng, radius):
+    """Get the (min_lat, max_lat, min_lng, max_lng) box enclosing a radius in kilometers"""
+    R = 6371  # Earth's radius in kilometers
+    
+    angular_radius = radius / R
+    min_lat = lat - math.degrees(angular_radius)
+    max_lat = lat + math.degrees(angular_radius)
+    
+    # Circles covering a pole span every longitude
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+    
+    delta_lng = math.degrees(math.asin(math.sin(angular_radius) / math.cos(math.radians(lat))))
+    min_lng = lng - delta_lng
+    max_lng = lng + delta_lng
+    
+    # Circles crossing the antimeridian wrap around, so don't restrict longitude
+    if min_lng < -180 or max_lng > 180:
+        return min_lat, max_lat, -180.0, 180.0
+    
+    return min_lat, max_lat, min_lng, max_lng
+
 def calculate_price(check_in, check_out, price_per_hour):
     """Calculate total price based on duration and hourly rate"""
     if isinstance(check_in, str):
@@ -27,6 +100,13 @@ def calculate_price(check_in, check_out, price_per_hour):
     total_price = duration * price_per_hour
     return round(total_price, 2)
 
+def parse_datetime(value):
+    """Parse an ISO 8601 string into a naive UTC datetime"""
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
 def format_datetime(dt):
     """Format datetime for display"""
     if isinstance(dt, str):
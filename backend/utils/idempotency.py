@@ -0,0 +1,108 @@
+import hashlib
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import current_app, jsonify, request, Response
+from flask_jwt_extended import get_jwt_identity
+from models import db, IdempotencyKey
+from utils.helpers import dialect_insert
+
+MAX_KEY_LENGTH = 255
+
+def _request_hash():
+    digest = hashlib.sha256(f'{request.method} {request.path}\n'.encode('utf-8'))
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+def _lookup(user_id, key):
+    """Get the stored (id, request_hash, status_code, response_body, created_at, expires_at) of a key"""
+    return db.session.query(
+        IdempotencyKey.id, IdempotencyKey.request_hash, IdempotencyKey.status_code,
+        IdempotencyKey.response_body, IdempotencyKey.created_at, IdempotencyKey.expires_at
+    ).filter_by(user_id=user_id, key=key).first()
+
+def _claim(user_id, key, request_hash):
+    """Record that this request is running under key; False if another request holds it"""
+    now = datetime.utcnow()
+    result = db.session.execute(
+        dialect_insert(IdempotencyKey).values(
+            user_id=user_id, key=key, request_hash=request_hash, created_at=now,
+            expires_at=now + current_app.config['IDEMPOTENCY_KEY_TTL']
+        ).on_conflict_do_nothing(index_elements=['user_id', 'key'])
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+def _delete(*conditions):
+    db.session.execute(db.delete(IdempotencyKey).where(*conditions))
+    db.session.commit()
+
+def _replay(stored, request_hash):
+    if stored is not None and stored.request_hash != request_hash:
+        return jsonify({'error': 'Idempotency-Key was already used for a different request'}), 422
+    
+    # A key released between our claim attempt and lookup is treated as busy too
+    if stored is None or stored.status_code is None:
+        response = jsonify({'error': 'A request with this Idempotency-Key is still in progress'})
+        response.headers['Retry-After'] = '1'
+        return response, 409
+    
+    response = Response(stored.response_body, status=stored.status_code, mimetype='application/json')
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+def idempotent(fn):
+    """Replay the stored response when a request is retried with the same Idempotency-Key header
+    
+    Keys are scoped to the authenticated user and kept for IDEMPOTENCY_KEY_TTL,
+    so a retry costs one indexed lookup and never reaches the view. A retry
+    while the first request is running gets 409; reusing a key with a
+    different body gets 422. 5xx responses aren't stored, so those requests
+    can be retried. Apply after the authentication decorators.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if key is None:
+            return fn(*args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({'error': f'Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters'}), 400
+        
+        user_id = int(get_jwt_identity())
+        request_hash = _request_hash()
+        
+        stored = _lookup(user_id, key)
+        if stored is not None:
+            now = datetime.utcnow()
+            lock_timeout = timedelta(seconds=current_app.config['IDEMPOTENCY_LOCK_TIMEOUT'])
+            abandoned = stored.status_code is None and stored.created_at < now - lock_timeout
+            if stored.expires_at > now and not abandoned:
+                return _replay(stored, request_hash)
+            _delete(IdempotencyKey.id == stored.id)
+        
+        if not _claim(user_id, key, request_hash):
+            # Another request with the same key claimed it first
+            return _replay(_lookup(user_id, key), request_hash)
+        
+        claimed = (IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        try:
+            response = current_app.make_response(fn(*args, **kwargs))
+        except Exception:
+            db.session.rollback()
+            _delete(*claimed)
+            raise
+        
+        if response.status_code >= 500:
+            db.session.rollback()
+            _delete(*claimed)
+            return response
+        
+        if response.status_code >= 400:
+            db.session.rollback()  # Error responses must not commit anything the view left pending
+        db.session.execute(
+            db.update(IdempotencyKey)
+            .where(*claimed)
+            .values(status_code=response.status_code, response_body=response.get_data(as_text=True))
+        )
+        db.session.commit()
+        return response
+    return wrapper
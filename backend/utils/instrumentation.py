@@ -0,0 +1,227 @@
+import cProfile
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from flask import current_app, g, has_request_context, request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Request duration histogram buckets in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+class RequestStats:
+    """Timings collected while serving one request"""
+    
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+        self.serialize_time = 0.0
+    
+    def add_query(self, statement, duration):
+        self.queries += 1
+        self.sql_time += duration
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+class Metrics:
+    """Request metrics aggregated in this process, rendered in Prometheus text format
+    
+    Each worker process keeps its own counters, like the memory cache backend.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}   # (method, endpoint, status) -> count
+        self._durations = {}  # endpoint -> [bucket counts..., sum, count]
+        self._sql = {}        # endpoint -> [queries, seconds, slowest seconds]
+        self._serialize = {}  # endpoint -> seconds
+    
+    def observe(self, method, endpoint, status, wall_time, stats):
+        with self._lock:
+            key = (method, endpoint, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            
+            histogram = self._durations.setdefault(endpoint, [0] * len(DURATION_BUCKETS) + [0.0, 0])
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if wall_time <= bound:
+                    histogram[i] += 1
+            histogram[-2] += wall_time
+            histogram[-1] += 1
+            
+            sql = self._sql.setdefault(endpoint, [0, 0.0, 0.0])
+            sql[0] += stats.queries
+            sql[1] += stats.sql_time
+            sql[2] = max(sql[2], stats.slowest_time)
+            
+            self._serialize[endpoint] = self._serialize.get(endpoint, 0.0) + stats.serialize_time
+    
+    def render(self):
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            lines += ['# HELP vcloak_http_requests_total Requests served.',
+                      '# TYPE vcloak_http_requests_total counter']
+            for (method, endpoint, status), count in sorted(self._requests.items()):
+                lines.append(f'vcloak_http_requests_total{{method="{method}",endpoint="{endpoint}",'
+                             f'status="{status}"}} {count}')
+            
+            lines += ['# HELP vcloak_http_request_duration_seconds Request wall time.',
+                      '# TYPE vcloak_http_request_duration_seconds histogram']
+            for endpoint, histogram in sorted(self._durations.items()):
+                for bound, count in zip(DURATION_BUCKETS, histogram):
+                    lines.append(f'vcloak_http_request_duration_seconds_bucket{{endpoint="{endpoint}",'
+                                 f'le="{bound}"}} {count}')
+                lines.append(f'vcloak_http_request_duration_seconds_bucket{{endpoint="{endpoint}",'
+                             f'le="+Inf"}} {histogram[-1]}')
+                lines.append(f'vcloak_http_request_duration_seconds_sum{{endpoint="{endpoint}"}} {histogram[-2]}')
+                lines.append(f'vcloak_http_request_duration_seconds_count{{endpoint="{endpoint}"}} {histogram[-1]}')
+            
+            for name, index, kind, help_text in (
+                ('vcloak_db_queries_total', 0, 'counter', 'SQL statements executed.'),
+                ('vcloak_db_query_seconds_total', 1, 'counter', 'Time spent executing SQL.'),
+                ('vcloak_db_slowest_query_seconds', 2, 'gauge', 'Slowest SQL statement seen.')
+            ):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+                for endpoint, sql in sorted(self._sql.items()):
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} {sql[index]}')
+            
+            lines += ['# HELP vcloak_serialization_seconds_total Time spent encoding JSON responses.',
+                      '# TYPE vcloak_serialization_seconds_total counter']
+            for endpoint, seconds in sorted(self._serialize.items()):
+                lines.append(f'vcloak_serialization_seconds_total{{endpoint="{endpoint}"}} {seconds}')
+        return '\n'.join(lines) + '\n'
+
+def _current_stats():
+    if has_request_context():
+        return g.get('request_stats')
+    return None
+
+@contextmanager
+def timed_serialization():
+    """Count the time spent in the block as JSON serialization of the current request"""
+    stats = _current_stats()
+    if stats is None:
+        yield
+        return
+    
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serialize_time += time.perf_counter() - start
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats() is not None:
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats()
+    starts = conn.info.get('query_start_time')
+    if stats is not None and starts:
+        stats.add_query(statement, time.perf_counter() - starts.pop())
+
+_listening = False
+_listen_lock = threading.Lock()
+
+def _listen_for_queries():
+    """Time SQL statements on every engine, including ones created later"""
+    global _listening
+    with _listen_lock:
+        if not _listening:
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            _listening = True
+
+# cProfile can only run one profile at a time per process
+_profile_lock = threading.Lock()
+
+def _start_request():
+    g.request_stats = RequestStats()
+    
+    rate = current_app.config['PROFILE_SAMPLE_RATE']
+    if rate and random.random() < rate and _profile_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # Another profiler is already active
+            _profile_lock.release()
+            return
+        g.profiler = profiler
+
+def _stop_profiler():
+    """Stop the current request's profiler, if it was sampled, and return it"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        _profile_lock.release()
+    return profiler
+
+def _finish_request(response):
+    stats = g.pop('request_stats', None)
+    if stats is None:
+        return response
+    
+    wall_time = time.perf_counter() - stats.started_at
+    endpoint = request.endpoint or 'unknown'
+    profiler = _stop_profiler()
+    
+    response.headers['Server-Timing'] = ', '.join([
+        f'app;dur={wall_time * 1000:.1f}',
+        f'db;dur={stats.sql_time * 1000:.1f};desc="{stats.queries} queries"',
+        f'db-slowest;dur={stats.slowest_time * 1000:.1f}',
+        f'serialize;dur={stats.serialize_time * 1000:.1f}'
+    ])
+    current_app.extensions['metrics'].observe(request.method, endpoint, response.status_code, wall_time, stats)
+    
+    if wall_time * 1000 >= current_app.config['SLOW_REQUEST_MS']:
+        current_app.logger.warning(
+            'Slow request %s %s: %.1fms, %d queries in %.1fms, serialize %.1fms, slowest query %.1fms: %s',
+            request.method, request.path, wall_time * 1000, stats.queries, stats.sql_time * 1000,
+            stats.serialize_time * 1000, stats.slowest_time * 1000, (stats.slowest_statement or '')[:500]
+        )
+        if profiler is not None:
+            profile_dir = current_app.config['PROFILE_DIR']
+            os.makedirs(profile_dir, exist_ok=True)
+            name = f"{int(time.time() * 1000)}-{request.method}-{endpoint.replace('.', '_')}.prof"
+            profiler.dump_stats(os.path.join(profile_dir, name))
+    return response
+
+def _teardown_request(error):
+    # Requests that never reached after_request must not keep the profiler running
+    _stop_profiler()
+
+def metrics_view():
+    """Prometheus scrape endpoint, guarded by METRICS_TOKEN when it is set"""
+    token = current_app.config['METRICS_TOKEN']
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return Response('Unauthorized\n', status=401, mimetype='text/plain')
+    
+    return Response(current_app.extensions['metrics'].render(),
+                    mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+def init_instrumentation(app):
+    """Record per-request timings when INSTRUMENTATION_ENABLED is set
+    
+    Adds a Server-Timing header to every response, serves aggregated metrics
+    at /metrics and logs requests slower than SLOW_REQUEST_MS. A
+    PROFILE_SAMPLE_RATE share of requests runs under cProfile; profiles of
+    the slow ones are written to PROFILE_DIR. Call before other hooks are
+    installed so the wall time covers them.
+    """
+    if not app.config['INSTRUMENTATION_ENABLED']:
+        return None
+    
+    metrics = Metrics()
+    app.extensions['metrics'] = metrics
+    _listen_for_queries()
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+    return metrics
@@ -0,0 +1,200 @@
+import os
+import random
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta
+from flask import current_app, g, has_request_context
+from sqlalchemy import case
+from models import db, Job
+from utils.helpers import dialect_insert
+
+# Job name -> handler, filled in by @job as the modules defining them are imported
+_handlers = {}
+
+def job(name):
+    """Register a function as the handler of a job name
+    
+    Handlers are called with the job payload as keyword arguments, inside
+    the transaction that marks the job done. Their database writes commit
+    with it, so they take effect once even if the job is retried.
+    """
+    def decorator(fn):
+        _handlers[name] = fn
+        return fn
+    return decorator
+
+def enqueue(name, payload, key=None, delay=None, max_attempts=None):
+    """Queue a job in the current transaction
+    
+    Workers only see the job once the caller commits, so nothing runs for a
+    request that rolls back. If key was already queued the job is dropped.
+    """
+    if name not in _handlers:
+        raise LookupError(f'No handler registered for job {name}')
+    
+    stmt = dialect_insert(Job).values(
+        name=name,
+        payload=payload,
+        idempotency_key=key,
+        status='pending',
+        attempts=0,
+        max_attempts=max_attempts or current_app.config['JOB_MAX_ATTEMPTS'],
+        run_at=datetime.utcnow() + (delay or timedelta())
+    )
+    if key is not None:
+        stmt = stmt.on_conflict_do_nothing(index_elements=['idempotency_key'])
+    db.session.execute(stmt)
+    
+    if has_request_context():
+        g.jobs_enqueued = True
+
+def backoff(attempts):
+    """Get the delay before retrying a job that failed attempts times: exponential, capped, jittered"""
+    base = current_app.config['JOB_BACKOFF_BASE']
+    delay = min(base * 2 ** (attempts - 1), current_app.config['JOB_BACKOFF_MAX'])
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+def requeue_stale():
+    """Return jobs whose worker died mid-run to the queue, or fail them if out of attempts
+    
+    Returns the number of jobs touched.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=current_app.config['JOB_LOCK_TIMEOUT'])
+    result = db.session.execute(
+        db.update(Job)
+        .where(Job.status == 'running', Job.locked_at < cutoff)
+        .values(
+            status=case((Job.attempts >= Job.max_attempts, 'failed'), else_='pending'),
+            locked_by=None,
+            locked_at=None
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
+def claim(worker_id, limit):
+    """Lock up to limit due jobs for this worker, oldest first, and return their ids
+    
+    Candidates are read with SKIP LOCKED on PostgreSQL; the claiming UPDATE
+    re-checks the status, so on SQLite two workers can't claim the same job.
+    """
+    now = datetime.utcnow()
+    candidates = db.session.scalars(
+        db.select(Job.id)
+        .where(Job.status == 'pending', Job.run_at <= now)
+        .order_by(Job.run_at, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not candidates:
+        db.session.rollback()
+        return []
+    
+    claimed = db.session.scalars(
+        db.update(Job)
+        .where(Job.id.in_(candidates), Job.status == 'pending')
+        .values(status='running', locked_by=worker_id, locked_at=now, attempts=Job.attempts + 1)
+        .returning(Job.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.session.commit()
+    return sorted(claimed)
+
+def _finish(job_id, worker_id, **values):
+    """Update a job this worker still holds; False if it was requeued and taken by another"""
+    result = db.session.execute(
+        db.update(Job)
+        .where(Job.id == job_id, Job.status == 'running', Job.locked_by == worker_id)
+        .values(locked_by=None, locked_at=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def run_job(job_id, worker_id):
+    """Run one claimed job, then mark it done or schedule its retry
+    
+    Returns True if the job succeeded.
+    """
+    name, payload, attempts, max_attempts = db.session.query(
+        Job.name, Job.payload, Job.attempts, Job.max_attempts
+    ).filter_by(id=job_id).one()
+    
+    try:
+        handler = _handlers.get(name)
+        if handler is None:
+            raise LookupError(f'No handler registered for job {name}')
+        handler(**payload)
+        
+        if _finish(job_id, worker_id, status='done', last_error=None):
+            db.session.commit()
+        else:
+            db.session.rollback()
+        return True
+    except Exception:
+        db.session.rollback()
+        error = traceback.format_exc()
+    
+    if attempts >= max_attempts:
+        current_app.logger.error('Job %s (%s) failed after %d attempts:\n%s', job_id, name, attempts, error)
+        _finish(job_id, worker_id, status='failed', last_error=error)
+    else:
+        current_app.logger.warning('Job %s (%s) failed, attempt %d of %d:\n%s',
+                                   job_id, name, attempts, max_attempts, error)
+        _finish(job_id, worker_id, status='pending', last_error=error,
+                run_at=datetime.utcnow() + backoff(attempts))
+    db.session.commit()
+    return False
+
+def release(job_ids, worker_id):
+    """Hand claimed jobs that haven't run back to the queue"""
+    db.session.execute(
+        db.update(Job)
+        .where(Job.id.in_(job_ids), Job.status == 'running', Job.locked_by == worker_id)
+        .values(status='pending', locked_by=None, locked_at=None, attempts=Job.attempts - 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+def work(burst=False, batch_size=None, poll_interval=None, worker_id=None, stopping=None):
+    """Run due jobs until the stopping event is set, or with burst until none are due
+    
+    Jobs claimed but not started when stopping is set go back to the queue.
+    Returns (succeeded, failed) counts.
+    """
+    batch_size = batch_size or current_app.config['JOB_BATCH_SIZE']
+    poll_interval = poll_interval if poll_interval is not None else current_app.config['JOB_POLL_INTERVAL']
+    worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+    stopping = stopping or threading.Event()
+    
+    succeeded = failed = 0
+    while not stopping.is_set():
+        requeue_stale()
+        job_ids = claim(worker_id, batch_size)
+        
+        for i, job_id in enumerate(job_ids):
+            if stopping.is_set():
+                release(job_ids[i:], worker_id)
+                break
+            if run_job(job_id, worker_id):
+                succeeded += 1
+            else:
+                failed += 1
+        
+        if not job_ids:
+            if burst:
+                break
+            stopping.wait(poll_interval)
+    return succeeded, failed
+
+def _run_inline(response):
+    # Development without a worker: run what this request queued once it has committed
+    if g.pop('jobs_enqueued', False):
+        work(burst=True, worker_id=f'inline:{os.getpid()}')
+    return response
+
+def init_jobs(app):
+    """Run queued jobs at the end of the request that queued them when JOBS_RUN_INLINE is set"""
+    if app.config['JOBS_RUN_INLINE']:
+        app.after_request(_run_inline)
@@ -0,0 +1,61 @@
+from datetime import date
+from flask.json.provider import DefaultJSONProvider, _default as flask_default
+from utils.instrumentation import timed_serialization
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+def _default(o):
+    """Serialize dates and datetimes as ISO 8601, everything else like Flask does"""
+    if isinstance(o, date):
+        return o.isoformat()
+    return flask_default(o)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson when it is installed
+    
+    Datetimes are encoded as ISO 8601 by both backends, so models can put
+    them in their dicts as-is.
+    """
+    
+    default = staticmethod(_default)
+    
+    def _orjson_options(self, kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize data as JSON to a string"""
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._orjson_options(kwargs)).decode('utf-8')
+    
+    def dumps_bytes(self, obj, **kwargs):
+        """Serialize data as UTF-8 encoded JSON"""
+        if orjson is None:
+            return super().dumps(obj, **kwargs).encode('utf-8')
+        return orjson.dumps(obj, default=self.default, option=self._orjson_options(kwargs))
+    
+    def loads(self, s, **kwargs):
+        """Deserialize data as JSON from a string or bytes"""
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        """Serialize the arguments as a JSON response without an intermediate str"""
+        obj = self._prepare_response_obj(args, kwargs)
+        dump_args = {}
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            dump_args['indent'] = 2
+        else:
+            dump_args['separators'] = (',', ':')
+        with timed_serialization():
+            body = self.dumps_bytes(obj, **dump_args)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
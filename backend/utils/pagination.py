@@ -0,0 +1,67 @@
+import base64
+import json
+from datetime import datetime
+from flask import request, current_app
+from sqlalchemy import tuple_
+
+def encode_cursor(values):
+    """Encode the ordering values of the last row into an opaque cursor"""
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor, columns):
+    """Decode a cursor back into values typed for the ordering columns"""
+    values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError('Cursor does not match ordering')
+    
+    decoded = []
+    for column, value in zip(columns, values):
+        if column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif column.type.python_type is int:
+            value = int(value)
+        decoded.append(value)
+    return decoded
+
+def parse_page_args(*columns):
+    """Read limit and cursor query parameters for a listing ordered by columns
+    
+    Returns (limit, cursor, error) where cursor is None on the first page.
+    """
+    default_limit = current_app.config['PAGE_SIZE_DEFAULT']
+    max_limit = current_app.config['PAGE_SIZE_MAX']
+    
+    limit = request.args.get('limit', default_limit, type=int)
+    if limit < 1:
+        return None, None, 'Limit must be a positive integer'
+    limit = min(limit, max_limit)
+    
+    cursor = request.args.get('cursor')
+    if not cursor:
+        return limit, None, None
+    
+    try:
+        return limit, decode_cursor(cursor, columns), None
+    except (ValueError, TypeError):
+        return None, None, 'Invalid cursor'
+
+def paginate(query, limit, cursor, *columns):
+    """Fetch one page of query ordered descending by columns
+    
+    Uses keyset pagination so deep pages cost the same as the first one, as
+    long as an index covers the ordering columns. Returns (items, next_cursor).
+    """
+    if cursor is not None:
+        query = query.filter(tuple_(*columns) < tuple_(*cursor))
+    
+    # Fetch one extra row to know whether another page exists
+    items = query.order_by(*[column.desc() for column in columns]).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+    
+    return items, next_cursor
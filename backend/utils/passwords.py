@@ -0,0 +1,58 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from flask import current_app
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashes are already queued"""
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+def _get_pool():
+    """Create the hashing pool on first use, sized from the app config"""
+    global _executor, _slots
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                workers = current_app.config['PASSWORD_HASH_WORKERS']
+                _slots = threading.BoundedSemaphore(workers + current_app.config['PASSWORD_HASH_QUEUE'])
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+    return _executor, _slots
+
+def _run(fn, *args):
+    """Run fn on the hashing pool and wait for its result
+    
+    bcrypt releases the GIL, so hashes run in parallel with other request
+    threads, while the pool size caps how many cores hashing can take.
+    """
+    executor, slots = _get_pool()
+    if not slots.acquire(timeout=current_app.config['PASSWORD_HASH_TIMEOUT']):
+        raise PasswordHasherBusy()
+    
+    try:
+        future = executor.submit(fn, *args)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future.result()
+
+def hash_password(password):
+    """Hash a password with the configured bcrypt cost"""
+    rounds = current_app.config['BCRYPT_ROUNDS']
+    hashed = _run(lambda: bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)))
+    return hashed.decode('utf-8')
+
+def verify_password(password, password_hash):
+    """Check a password against a bcrypt hash"""
+    return _run(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+def needs_rehash(password_hash):
+    """Check whether a hash was made with a different cost than configured"""
+    try:
+        rounds = int(password_hash.split('$')[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != current_app.config['BCRYPT_ROUNDS']
@@ -0,0 +1,52 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from models import db
+
+class QueryCounter:
+    """Collects the SQL statements executed against an engine, with their parameters"""
+    
+    def __init__(self):
+        self.statements = []
+        self.parameters = []
+    
+    @property
+    def count(self):
+        return len(self.statements)
+    
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+
+@contextmanager
+def count_queries(engine=None):
+    """Count SQL statements executed inside the block
+    
+    Usage:
+        with count_queries() as counter:
+            client.get('/api/bookings', headers=headers)
+        print(counter.count)
+    """
+    engine = engine or db.engine
+    counter = QueryCounter()
+    event.listen(engine, 'before_cursor_execute', counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter)
+
+@contextmanager
+def assert_max_queries(max_queries, engine=None):
+    """Fail if the block executes more than max_queries SQL statements
+    
+    Meant for tests guarding against N+1 regressions:
+        with app.app_context(), assert_max_queries(4):
+            client.get('/api/admin/bookings', headers=admin_headers)
+    """
+    with count_queries(engine) as counter:
+        yield counter
+    
+    if counter.count > max_queries:
+        statements = '\n'.join(f'  {i + 1}. {s}' for i, s in enumerate(counter.statements))
+        raise AssertionError(
+            f'Expected at most {max_queries} queries, got {counter.count}:\n{statements}'
+        )
@@ -0,0 +1,143 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, request, jsonify
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+def parse_limit(limit):
+    """Parse a limit like '5/minute' into (tokens per second, burst size)"""
+    count, period = limit.split('/')
+    count = int(count)
+    return count / PERIODS[period.strip()], count
+
+class MemoryRateLimitBackend:
+    """Token buckets kept in this process, least recently used evicted first"""
+    
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def consume(self, key, rate, burst):
+        """Take one token from a bucket
+        
+        Returns (allowed, seconds until a token is available).
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+class RedisRateLimitBackend:
+    """Token buckets shared between workers through a Redis-compatible client"""
+    
+    # Refill and take a token atomically on the server
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+    
+    def __init__(self, client, prefix='vcloak:ratelimit:'):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(self.SCRIPT)
+    
+    def consume(self, key, rate, burst):
+        """Take one token from a bucket
+        
+        Returns (allowed, seconds until a token is available).
+        """
+        allowed, tokens = self._script(keys=[self.prefix + key], args=[rate, burst, time.time()])
+        if int(allowed):
+            return True, 0
+        return False, (1 - float(tokens)) / rate
+
+def _client_ip():
+    return request.remote_addr
+
+def _login_email():
+    data = request.get_json(silent=True) or {}
+    email = data.get('email')
+    return email.strip().lower() if isinstance(email, str) else None
+
+# What each limit can be keyed by; limits whose key is missing are skipped
+KEY_FUNCTIONS = {
+    'ip': _client_ip,
+    'email': _login_email
+}
+
+def _limits_for_request():
+    """Get the configured limits for the current endpoint, else its blueprint"""
+    limits = current_app.config['RATE_LIMITS']
+    if request.endpoint in limits:
+        return limits[request.endpoint]
+    return limits.get(request.blueprint, {})
+
+def check_rate_limit():
+    """before_request hook rejecting requests over their limits with 429
+    
+    Runs before the view, so throttled requests never touch the database or bcrypt.
+    """
+    if not current_app.config['RATE_LIMIT_ENABLED'] or request.method == 'OPTIONS':
+        return None
+    
+    backend = current_app.extensions['rate_limiter']
+    retry_after = 0
+    for key_name, limit in _limits_for_request().items():
+        value = KEY_FUNCTIONS[key_name]()
+        if value is None:
+            continue
+        
+        rate, burst = parse_limit(limit)
+        allowed, wait = backend.consume(f'{request.endpoint}:{key_name}:{value}', rate, burst)
+        if not allowed:
+            retry_after = max(retry_after, wait)
+    
+    if retry_after:
+        response = jsonify({'error': 'Too many requests, please try again later'})
+        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+        return response, 429
+    return None
+
+def init_rate_limiter(app):
+    """Create the rate limit backend configured by RATE_LIMIT_BACKEND and install the hook"""
+    backend = app.config['RATE_LIMIT_BACKEND']
+    
+    if backend == 'redis':
+        import redis  # Optional dependency, only needed for the shared backend
+        client = redis.Redis.from_url(app.config['RATE_LIMIT_REDIS_URL'])
+        limiter = RedisRateLimitBackend(client)
+    elif backend == 'memory':
+        limiter = MemoryRateLimitBackend()
+    else:
+        raise ValueError(f'Unknown RATE_LIMIT_BACKEND: {backend}')
+    
+    app.extensions['rate_limiter'] = limiter
+    app.before_request(check_rate_limit)
+    return limiter
@@ -0,0 +1,63 @@
+import random
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from utils.cache import get_cache
+
+READ_METHODS = ('GET', 'HEAD')
+
+def use_primary(fn):
+    """Mark a GET view that must read from the primary, e.g. right after login or signup"""
+    fn.use_primary = True
+    return fn
+
+def _request_user_id():
+    """Get the user id of the request's access token, or None without a valid one"""
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None  # The view reports bad tokens itself
+
+def _sticky_key(user_id):
+    return f'read-primary:{user_id}'
+
+def choose_bind():
+    """Assign GET requests a random replica unless the user wrote within REPLICA_STICKY_SECONDS"""
+    if request.method not in READ_METHODS:
+        return
+    view = current_app.view_functions.get(request.endpoint)
+    if view is None or getattr(view, 'use_primary', False):
+        return
+    
+    user_id = _request_user_id()
+    if user_id is not None and get_cache().get(_sticky_key(user_id)) is not None:
+        return
+    g.db_replica = random.choice(list(current_app.config['SQLALCHEMY_BINDS']))
+
+def remember_write(response):
+    """Keep the next reads of a user who just wrote on the primary, so they see their changes"""
+    if g.pop('db_wrote', False):
+        user_id = _request_user_id()
+        if user_id is not None:
+            get_cache().set(_sticky_key(user_id), 1, ttl=current_app.config['REPLICA_STICKY_SECONDS'])
+    return response
+
+def init_replicas(app):
+    """Route GET requests to the DATABASE_REPLICA_URLS replicas when any are configured
+    
+    Read-your-writes stickiness lives in the cache, so it must be shared by
+    every worker: startup fails outside debug and testing unless
+    CACHE_BACKEND is redis.
+    """
+    if not app.config['DATABASE_REPLICA_URLS']:
+        return
+    
+    if app.config['CACHE_BACKEND'] != 'redis':
+        message = ('DATABASE_REPLICA_URLS needs CACHE_BACKEND=redis: with a per-process cache, '
+                   "a user's reads after a write can reach a lagging replica from another worker")
+        if not (app.debug or app.testing):
+            raise RuntimeError(message)
+        app.logger.warning(message)
+    
+    app.before_request(choose_bind)
+    app.after_request(remember_write)
@@ -0,0 +1,37 @@
+from flask import Response, current_app, request, stream_with_context
+
+STREAM_FORMATS = ('ndjson', 'stream')
+
+def is_streaming_request():
+    """Check whether the client asked for a streamed list instead of a page
+    
+    ?format=ndjson (or Accept: application/x-ndjson) streams one JSON object
+    per line; ?format=stream streams a regular JSON document in chunks.
+    """
+    if request.args.get('format') in STREAM_FORMATS:
+        return True
+    return request.accept_mimetypes.best == 'application/x-ndjson'
+
+def stream_list(key, rows, serialize):
+    """Stream every row of a query without holding the whole list in memory
+    
+    rows should be an iterator that fetches lazily, e.g. query.yield_per(n).
+    """
+    encoder = current_app.json
+    
+    if request.args.get('format') == 'stream':
+        def generate():
+            yield '{' + encoder.dumps(key) + ':['
+            first = True
+            for row in rows:
+                yield ('' if first else ',') + encoder.dumps(serialize(row))
+                first = False
+            yield ']}\n'
+        mimetype = 'application/json'
+    else:
+        def generate():
+            for row in rows:
+                yield encoder.dumps(serialize(row)) + '\n'
+        mimetype = 'application/x-ndjson'
+    
+    return Response(stream_with_context(generate()), mimetype=mimetype)
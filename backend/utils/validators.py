@@ -1,8 +1,10 @@
 import re
-from email_validator import validate_email, EmailNotValidError
 
 def validate_email_address(email):
     """Validate email format"""
+    # Imported here, it's slow to load and only the auth endpoints need it
+    from email_validator import validate_email, EmailNotValidError
+    
     try:
         validate_email(email)
         return True, None
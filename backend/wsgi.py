@@ -0,0 +1,5 @@
+"""WSGI entry point for gunicorn (see gunicorn.conf.py)"""
+import os
+from app import create_app
+
+app = create_app(os.getenv('FLASK_ENV', 'production'))
@@ -4,4 +4,8 @@
 echo "Installing dependencies..."
 pip install -r backend/requirements.txt
 
+# Migrations and the admin account run once per deploy, not on every worker boot
+echo "Preparing database..."
+(cd backend && flask --app wsgi init-db && flask --app wsgi seed-admin)
+
 echo "Build complete!"
@@ -29,6 +29,14 @@ function setCurrentUser(user) {
     localStorage.setItem('user', JSON.stringify(user));
 }
 
+// Random key for the Idempotency-Key header; reuse it when retrying the same submission
+function newIdempotencyKey() {
+    if (window.crypto && crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    return Array.from(crypto.getRandomValues(new Uint8Array(16)), b => b.toString(16).padStart(2, '0')).join('');
+}
+
 // API Client
 const api = {
     async request(endpoint, options = {}) {
@@ -52,7 +60,10 @@ const api = {
             const data = await response.json();
 
             if (!response.ok) {
-                throw new Error(data.error || 'Request failed');
+                const error = new Error(data.error || 'Request failed');
+                error.status = response.status;
+                error.retryAfter = response.headers.get('Retry-After');
+                throw error;
             }
 
             return data;
@@ -62,6 +73,22 @@ const api = {
         }
     },
 
+    // Load every page of a list endpoint by following next_cursor; resolves to { [key]: allItems }
+    async requestAll(endpoint, key, params = {}) {
+        const items = [];
+        let cursor = null;
+        do {
+            const query = new URLSearchParams({ limit: 500, ...params });
+            if (cursor) {
+                query.set('cursor', cursor);
+            }
+            const data = await this.request(`${endpoint}?${query}`);
+            items.push(...data[key]);
+            cursor = data.next_cursor;
+        } while (cursor);
+        return { [key]: items };
+    },
+
     // Auth endpoints
     async register(userData) {
         return this.request('/auth/register', {
@@ -96,8 +123,11 @@ const api = {
 
     // Location endpoints
     async getLocations(params = {}) {
-        const queryString = new URLSearchParams(params).toString();
-        return this.request(`/locations?${queryString}`);
+        return this.requestAll('/locations', 'locations', params);
+    },
+
+    async getMyLocations() {
+        return this.requestAll('/locations/mine', 'locations');
     },
 
     async getLocation(id) {
@@ -130,17 +160,17 @@ const api = {
 
     // Booking endpoints
     async getBookings(params = {}) {
-        const queryString = new URLSearchParams(params).toString();
-        return this.request(`/bookings?${queryString}`);
+        return this.requestAll('/bookings', 'bookings', params);
     },
 
     async getBooking(id) {
         return this.request(`/bookings/${id}`);
     },
 
-    async createBooking(bookingData) {
+    async createBooking(bookingData, idempotencyKey = newIdempotencyKey()) {
         return this.request('/bookings', {
             method: 'POST',
+            headers: { 'Idempotency-Key': idempotencyKey },
             body: JSON.stringify(bookingData),
         });
     },
@@ -153,13 +183,25 @@ const api = {
     },
 
     async getProviderBookings() {
-        return this.request('/bookings/provider');
+        return this.requestAll('/bookings/provider', 'bookings');
+    },
+
+    // Analytics endpoints
+    async getProviderAnalytics(params = {}) {
+        const queryString = new URLSearchParams(params).toString();
+        return this.request(`/analytics/provider?${queryString}`);
+    },
+
+    async getAdminAnalytics(params = {}) {
+        const queryString = new URLSearchParams(params).toString();
+        return this.request(`/analytics/admin?${queryString}`);
     },
 
     // Review endpoints
-    async createReview(reviewData) {
+    async createReview(reviewData, idempotencyKey = newIdempotencyKey()) {
         return this.request('/reviews', {
             method: 'POST',
+            headers: { 'Idempotency-Key': idempotencyKey },
             body: JSON.stringify(reviewData),
         });
     },
@@ -174,8 +216,7 @@ const api = {
     },
 
     async getProviders(params = {}) {
-        const queryString = new URLSearchParams(params).toString();
-        return this.request(`/admin/providers?${queryString}`);
+        return this.requestAll('/admin/providers', 'providers', params);
     },
 
     async verifyProvider(providerId, verifyLocations = false) {
@@ -192,8 +233,7 @@ const api = {
     },
 
     async getAllUsers(params = {}) {
-        const queryString = new URLSearchParams(params).toString();
-        return this.request(`/admin/users?${queryString}`);
+        return this.requestAll('/admin/users', 'users', params);
     },
 
     async updateUser(userId, userData) {
@@ -204,8 +244,7 @@ const api = {
     },
 
     async getAllBookings(params = {}) {
-        const queryString = new URLSearchParams(params).toString();
-        return this.request(`/admin/bookings?${queryString}`);
+        return this.requestAll('/admin/bookings', 'bookings', params);
     },
 };
 